@@ -1,63 +1,21 @@
 import streamlit as st  # Import Streamlit library
 import time  # Import time for delays in animations
+import asyncio  # Import asyncio to run model calls concurrently
 
 try:
-    from models.o1_preview import O1PreviewModel
-    from models.o1_mini import O1MiniModel
-    from models.llama import LlamaModel
-    from models.gemini_model import GeminiModel
-    from models.gpt4o_model import GPT4oModel  # Updated import
-    from models.mistral_model import MistralModel
-    from models.llama_3_2_model import Llama32Model
-    from models.o1_analyzer import O1Analyzer  # Import the analyzer
+    from pipeline import Pipeline, StageCache, DEFAULT_RACE_MODELS  # Import the shared generate/explain/analyze pipeline
 
 except ImportError as e:
     st.error(f"Error importing models: {e}")
     st.stop()
 
-# Initialize the GPT-4o model
-gpt4o_model = GPT4oModel(
-    api_key=st.secrets["gpt4o"]["api_key"], 
-    base_url="https://api.aimlapi.com"
-)
+# Keep stage results across reruns so only stages whose inputs changed are recomputed
+if "stage_cache" not in st.session_state:
+    st.session_state.stage_cache = StageCache()
 
-# Initialize the Llama client
-llama_model = LlamaModel(
-    api_key=st.secrets["together"]["api_key"],
-    base_url="https://api.aimlapi.com/v1"
-)
-
-# Initialize the OpenAI clients for base models
-o1_preview_model = O1PreviewModel(
-    api_key=st.secrets["openai"]["api_key"],
-    base_url="https://api.aimlapi.com"
-)
-
-o1_mini_model = O1MiniModel(
-    api_key=st.secrets["openai_mini"]["api_key"],
-    base_url="https://api.aimlapi.com"
-)
-
-gemini_model = GeminiModel(
-    api_key=st.secrets["gemini"]["api_key"],
-    base_url="https://api.aimlapi.com"
-)
-
-mistral_model = MistralModel(
-    api_key=st.secrets["mistral"]["api_key"],  # Make sure to add your Mistral API key in Streamlit secrets
-    base_url="https://api.aimlapi.com"
-)
-
-llama_3_2_model = Llama32Model(
-    api_key=st.secrets["mistral"]["api_key"],
-    base_url="https://api.aimlapi.com/v1"
-)
-
-# Initialize the O1Analyzer
-o1_analyzer = O1Analyzer(
-    api_key=st.secrets["openai"]["api_key"],  # Assuming o1_preview uses the openai API key
-    base_url="https://api.aimlapi.com"
-)
+# Initialize the model clients and the O1Analyzer from the Streamlit secrets
+pipeline = Pipeline(st.secrets, cache=st.session_state.stage_cache)
+o1_analyzer = pipeline.analyzer
 
 # Initialize Streamlit session state for user input and model selection
 if "user_question" not in st.session_state:
@@ -69,31 +27,6 @@ if "compare_mode" not in st.session_state:
 if "selected_compare_models" not in st.session_state:
     st.session_state.selected_compare_models = []
 
-def generate_code(user_question, language, model_instance):
-    # Step 1: Use the Llama model to process the user's question
-    processed_string = llama_model.process_question(user_question)
-
-    # Step 2: Use the selected OpenAI model to generate optimized code
-    instruction = (
-        f"As a highly skilled software engineer, please analyze the following question thoroughly and provide optimized "
-        f"{language} code for the problem: {processed_string}. Make sure to give only code."
-    )
-    
-    # Generate code using the selected model instance
-    code = model_instance.generate_code(instruction)
-    return code
-
-def explain_code(code, model_instance):
-    # Step 1: Use OpenAI model to explain the generated code line by line
-    instruction = (
-        f"As a highly skilled software engineer, please provide a detailed line-by-line explanation of the following code:\n\n"
-        f"{code}\n\nMake sure to explain what each line does and why it is used."
-    )
-    
-    # Explain code using the selected model instance
-    explanation = model_instance.explain_code(instruction)
-    return explanation
-
 # Function to simulate typing animation for the welcome message
 def typing_animation(text, delay=0.05):
     typed_text = ""
@@ -123,14 +56,44 @@ st.sidebar.title("Input Section")
 languages = ["Python", "Java", "C++", "JavaScript", "Go", "Ruby", "Swift"]
 language = st.sidebar.selectbox("Select Programming Language:", options=languages, index=0)
 
-# Base Model Selection
-base_models = ["o1-preview", "o1-mini"]
-selected_base_model = st.sidebar.selectbox(
-    "Select Base Model:", 
-    options=base_models, 
-    index=base_models.index(st.session_state.selected_base_model)
-)
-st.session_state.selected_base_model = selected_base_model
+# Estimate complexities with the bundled parsers instead of extra model calls
+local_analysis = st.sidebar.checkbox("Local Complexity Analysis (no API calls)", value=False)
+
+# Cached stages are reused on Submit; clearing forces fresh answers from every model
+if st.sidebar.button("Clear Cached Results"):
+    st.session_state.stage_cache.clear()
+
+# Race mode: the base result comes from whichever raced model first returns valid code
+race_mode = st.sidebar.checkbox("Race Models (first valid answer wins)", value=False)
+
+if race_mode:
+    race_models = st.sidebar.multiselect(
+        "Select Models to Race:",
+        options=list(pipeline.models),
+        default=DEFAULT_RACE_MODELS
+    )
+    max_race_models = st.sidebar.number_input(
+        "Maximum Models to Call:",
+        min_value=1,
+        max_value=max(len(race_models), 1),
+        value=max(len(race_models), 1),
+        step=1
+    )
+else:
+    race_models = []
+    max_race_models = 0
+
+    # Base Model Selection (hidden in race mode, where the race supplies the base result)
+    base_models = ["o1-preview", "o1-mini"]
+    selected_base_model = st.sidebar.selectbox(
+        "Select Base Model:", 
+        options=base_models, 
+        index=base_models.index(st.session_state.selected_base_model)
+    )
+    st.session_state.selected_base_model = selected_base_model
+
+# The models a race will actually call, for the header and error messages
+raced_model_names = (race_models or DEFAULT_RACE_MODELS)[:max_race_models]
 
 # Comparison mode checkbox
 compare_mode = st.sidebar.checkbox("Compare with Other Models", key="compare_mode")
@@ -147,22 +110,27 @@ if compare_mode:
 else:
     st.session_state.selected_compare_models = []
 
-# Function to get model instances based on selection
-def get_model_instance(model_name):
-    if model_name == "o1-preview":
-        return o1_preview_model
-    elif model_name == "o1-mini":
-        return o1_mini_model
-    elif model_name == "gemini-1.5-pro":  
-        return gemini_model  
-    elif model_name == "gpt4o":
-        return gpt4o_model
-    elif model_name == "mistral":  
-        return mistral_model
-    elif model_name == "llama-3-2":  
-        return llama_3_2_model  
-    else:
-        return o1_preview_model  # Default fallback
+async def arace_base_model(user_question, language):
+    try:
+        return await pipeline.arace_models(user_question, language, race_models, max_models=max_race_models)
+    except Exception as e:
+        return {
+            "model_name": ", ".join(raced_model_names),
+            "code": "Error generating code.",
+            "explanation": f"Error: {e}",
+            "raced": raced_model_names
+        }
+
+async def arun_submission(user_question, language, model_names):
+    # Run the comparison models alongside the race so both share one event loop
+    if not race_mode:
+        return await pipeline.arun_models(user_question, language, model_names)
+    compare_names = {key: name for key, name in model_names.items() if key != "Base Model"}
+    race_result, results = await asyncio.gather(
+        arace_base_model(user_question, language),
+        pipeline.arun_models(user_question, language, compare_names)
+    )
+    return {"Base Model": race_result, **results}
 
 # Main area for the welcome message and generated code
 st.subheader("Welcome to the Code Optimizer")
@@ -174,11 +142,15 @@ for message in welcome_messages:
     time.sleep(1.5)  # Wait before displaying the next message
 
 # Display selected models information
+if race_mode:
+    base_model_label = f"Race of {', '.join(raced_model_names)}"
+else:
+    base_model_label = st.session_state.selected_base_model
 if compare_mode:
-    st.markdown(f"<h5 style='color: #4CAF50;'>Base Model: {st.session_state.selected_base_model}</h5>", unsafe_allow_html=True)
+    st.markdown(f"<h5 style='color: #4CAF50;'>Base Model: {base_model_label}</h5>", unsafe_allow_html=True)
     st.markdown(f"<h5 style='color: #4CAF50;'>Comparison Models: {', '.join(st.session_state.selected_compare_models) if st.session_state.selected_compare_models else 'None'}</h5>", unsafe_allow_html=True)
 else:
-    st.markdown(f"<h5 style='color: #4CAF50;'>Selected Model: {st.session_state.selected_base_model}</h5>", unsafe_allow_html=True)
+    st.markdown(f"<h5 style='color: #4CAF50;'>Selected Model: {base_model_label}</h5>", unsafe_allow_html=True)
 
 # Create a placeholder for the generated code
 code_container = st.empty()
@@ -192,42 +164,12 @@ with st.container():
     if st.button("Submit"):
         st.session_state.user_question = user_question  # Store the question in session state
         with st.spinner("Thinking..."):
-            results = {}
-            # Process Base Model
-            base_model_instance = get_model_instance(st.session_state.selected_base_model)
-            try:
-                base_code = generate_code(st.session_state.user_question, language, base_model_instance)
-                base_explanation = explain_code(base_code, base_model_instance)
-                results["Base Model"] = {
-                    "model_name": st.session_state.selected_base_model,
-                    "code": base_code,
-                    "explanation": base_explanation
-                }
-            except Exception as e:
-                results["Base Model"] = {
-                    "model_name": st.session_state.selected_base_model,
-                    "code": "Error generating code.",
-                    "explanation": f"Error: {e}"
-                }
-            
-            # Process Comparison Models if enabled
+            # Process the Base Model and any Comparison Models concurrently
+            model_names = {"Base Model": st.session_state.selected_base_model}
             if compare_mode and st.session_state.selected_compare_models:
                 for model_name in st.session_state.selected_compare_models:
-                    model_instance = get_model_instance(model_name)
-                    try:
-                        code = generate_code(st.session_state.user_question, language, model_instance)
-                        explanation = explain_code(code, model_instance)
-                        results[model_name] = {
-                            "model_name": model_name,
-                            "code": code,
-                            "explanation": explanation
-                        }
-                    except Exception as e:
-                        results[model_name] = {
-                            "model_name": model_name,
-                            "code": "Error generating code.",
-                            "explanation": f"Error: {e}"
-                        }
+                    model_names[model_name] = model_name
+            results = asyncio.run(arun_submission(st.session_state.user_question, language, model_names))
             
             # Analyze Complexities
             with st.spinner("Analyzing Complexities..."):
@@ -237,7 +179,9 @@ with st.container():
                     code_snippets[model_key] = model_info.get("code", "")
 
                 # Analyze complexities
-                analysis_results = o1_analyzer.analyze_complexity(code_snippets)
+                analysis_results = asyncio.run(
+                    pipeline.aanalyze_complexity(code_snippets, language=language, local=local_analysis)
+                )
 
                 # Generate complexity graph
                 complexity_graph = o1_analyzer.generate_complexity_graph(analysis_results)
@@ -258,6 +202,8 @@ with st.container():
                     model_info = results.get(model_key, {})
                     model_display_name = model_info.get("model_name", model_key)
                     st.subheader(f"**{model_display_name}**")
+                    if model_info.get("raced"):
+                        st.caption(f"Raced: {', '.join(model_info['raced'])}")
                     st.markdown("**Code:**")
                     st.code(model_info.get("code", "No code generated."), language=language.lower())
                     st.markdown("**Explanation:**")
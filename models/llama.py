@@ -1,13 +1,15 @@
 # models/llama.py
 
-from together import Together
+from together import AsyncTogether, Together
 
 class LlamaModel:
     def __init__(self, api_key, base_url="https://api.aimlapi.com/v1"):
         self.client = Together(base_url=base_url, api_key=api_key)
+        self.async_client = AsyncTogether(base_url=base_url, api_key=api_key)
 
-    def process_question(self, user_question):
-        response = self.client.chat.completions.create(
+    def _process_request(self, user_question):
+        # Shared by process_question and aprocess_question so both send the same payload
+        return dict(
             model="meta-llama/Llama-3.2-11B-Vision-Instruct-Turbo",
             messages=[
                 {
@@ -22,7 +24,16 @@ class LlamaModel:
             ],
             max_tokens=5000,
         )
-        
+
+    def _processed_string(self, response):
         llama_response = response.choices[0].message.content.strip()
         processed_string = llama_response.replace('"', '').replace("'", '').replace('\n', ' ')
         return processed_string
+
+    def process_question(self, user_question):
+        response = self.client.chat.completions.create(**self._process_request(user_question))
+        return self._processed_string(response)
+
+    async def aprocess_question(self, user_question):
+        response = await self.async_client.chat.completions.create(**self._process_request(user_question))
+        return self._processed_string(response)
@@ -1,13 +1,15 @@
 # models/llama_3_2_model.py
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 class Llama32Model:
     def __init__(self, api_key, base_url="https://api.aimlapi.com"):
         self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url)
 
-    def generate_code(self, instruction):
-        response = self.client.chat.completions.create(
+    def _generate_request(self, instruction):
+        # Shared by generate_code and agenerate_code so both send the same payload
+        return dict(
             model="meta-llama/Llama-3.2-3B-Instruct-Turbo",
             messages=[
                 {
@@ -21,10 +23,9 @@ class Llama32Model:
             ],
             max_tokens=5000,
         )
-        return response.choices[0].message.content.strip()
 
-    def explain_code(self, instruction):
-        response = self.client.chat.completions.create(
+    def _explain_request(self, instruction):
+        return dict(
             model="meta-llama/Llama-3.2-3B-Instruct-Turbo",
             messages=[
                 {
@@ -34,8 +35,23 @@ class Llama32Model:
                 {
                     "role": "user",
                     "content": instruction
-                }
+                },
             ],
             max_tokens=5000,
         )
+
+    def generate_code(self, instruction):
+        response = self.client.chat.completions.create(**self._generate_request(instruction))
+        return response.choices[0].message.content.strip()
+
+    def explain_code(self, instruction):
+        response = self.client.chat.completions.create(**self._explain_request(instruction))
+        return response.choices[0].message.content.strip()
+
+    async def agenerate_code(self, instruction):
+        response = await self.async_client.chat.completions.create(**self._generate_request(instruction))
+        return response.choices[0].message.content.strip()
+
+    async def aexplain_code(self, instruction):
+        response = await self.async_client.chat.completions.create(**self._explain_request(instruction))
         return response.choices[0].message.content.strip()
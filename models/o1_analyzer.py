@@ -1,18 +1,21 @@
-import streamlit as st
+import asyncio
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from .o1_preview import O1PreviewModel
+from .parsers import estimate_complexity, parse_code
 
 class O1Analyzer:
     def __init__(self, api_key, base_url="https://api.aimlapi.com"):
         self.model = O1PreviewModel(api_key=api_key, base_url=base_url)
 
-    def analyze_complexity(self, code_snippets):
+    def analyze_complexity(self, code_snippets, language=None, local=False):
         """
         Analyzes the time and space complexity of given code snippets.
 
         Parameters:
             code_snippets (dict): A dictionary where keys are model names and values are code strings.
+            language (str): The language the snippets are written in. Required for local analysis.
+            local (bool): Estimate complexities with the local parsers instead of the model.
+                Snippets that cannot be parsed still fall back to the model.
 
         Returns:
             dict: A dictionary containing complexity analysis for each code snippet.
@@ -20,46 +23,97 @@ class O1Analyzer:
         analysis_results = {}
 
         for model_name, code in code_snippets.items():
-            if code.startswith("Error"):
-                analysis_results[model_name] = {
-                    "time_complexity": "N/A",
-                    "space_complexity": "N/A",
-                    "error": code
-                }
-                continue
-
-            try:
-                # Generate time complexity
-                time_instruction = (
-                    f"As a software engineer, analyze the following {model_name} generated code and provide its "
-                    f"time complexity using Big O notation. Only provide the Big O notation without explanation.\n\n"
-                    f"```{code}```"
-                )
-                time_complexity = self.model.generate_code(time_instruction).strip()
-
-                # Generate space complexity
-                space_instruction = (
-                    f"As a software engineer, analyze the following {model_name} generated code and provide its "
-                    f"space complexity using Big O notation. Only provide the Big O notation without explanation.\n\n"
-                    f"```{code}```"
-                )
-                space_complexity = self.model.generate_code(space_instruction).strip()
-
-                analysis_results[model_name] = {
-                    "time_complexity": time_complexity,
-                    "space_complexity": space_complexity,
-                    "error": None
-                }
-
-            except Exception as e:
-                analysis_results[model_name] = {
-                    "time_complexity": "Error analyzing time complexity.",
-                    "space_complexity": "Error analyzing space complexity.",
-                    "error": str(e)
-                }
+            result = self._resolve_without_model(code, language, local)
+            if result is None:
+                try:
+                    # Generate time complexity
+                    time_instruction = self._complexity_instruction(model_name, code, "time")
+                    time_complexity = self.model.generate_code(time_instruction)
+
+                    # Generate space complexity
+                    space_instruction = self._complexity_instruction(model_name, code, "space")
+                    space_complexity = self.model.generate_code(space_instruction)
+
+                    result = self._analysis_result(time_complexity.strip(), space_complexity.strip())
+                except Exception as e:
+                    result = self._failed_analysis_result(e)
+            analysis_results[model_name] = result
 
         return analysis_results
 
+    async def aanalyze_complexity(self, code_snippets, language=None, local=False):
+        """
+        Async counterpart of analyze_complexity.
+
+        All snippets, and the time and space questions for each snippet, are sent
+        concurrently on the running event loop.
+
+        Parameters:
+            code_snippets (dict): A dictionary where keys are model names and values are code strings.
+            language (str): The language the snippets are written in. Required for local analysis.
+            local (bool): Estimate complexities with the local parsers instead of the model.
+
+        Returns:
+            dict: A dictionary containing complexity analysis for each code snippet.
+        """
+        model_names = list(code_snippets)
+        results = await asyncio.gather(*(
+            self._aanalyze_snippet(model_name, code_snippets[model_name], language, local)
+            for model_name in model_names
+        ))
+        return dict(zip(model_names, results))
+
+    async def _aanalyze_snippet(self, model_name, code, language, local):
+        result = self._resolve_without_model(code, language, local)
+        if result is not None:
+            return result
+        try:
+            time_complexity, space_complexity = await asyncio.gather(
+                self.model.agenerate_code(self._complexity_instruction(model_name, code, "time")),
+                self.model.agenerate_code(self._complexity_instruction(model_name, code, "space")),
+            )
+            return self._analysis_result(time_complexity.strip(), space_complexity.strip())
+        except Exception as e:
+            return self._failed_analysis_result(e)
+
+    def _resolve_without_model(self, code, language, local):
+        """
+        Handles the snippets that need no model call, shared by the sync and async paths.
+
+        Returns:
+            dict | None: The result for failed generations and locally estimated code, or None
+            when the model has to be asked.
+        """
+        if code.startswith("Error"):
+            return self._analysis_result("N/A", "N/A", error=code)
+
+        structure = parse_code(code, language) if local and language else None
+        # Ambiguous structures (e.g. memoised recursion inside a loop) are left to the model
+        estimate = estimate_complexity(structure) if structure is not None else None
+        if estimate is not None:
+            time_complexity, space_complexity = estimate
+            return self._analysis_result(time_complexity, space_complexity)
+        return None
+
+    def _analysis_result(self, time_complexity, space_complexity, error=None):
+        return {
+            "time_complexity": time_complexity,
+            "space_complexity": space_complexity,
+            "error": error
+        }
+
+    def _failed_analysis_result(self, error):
+        return self._analysis_result(
+            "Error analyzing time complexity.", "Error analyzing space complexity.", error=str(error)
+        )
+
+    def _complexity_instruction(self, model_name, code, kind):
+        return (
+            f"As a software engineer, analyze the following {model_name} generated code and provide its "
+            f"{kind} complexity using Big O notation. Only provide the Big O notation without explanation.\n\n"
+            f"```{code}```"
+        )
+
     def generate_complexity_graph(self, analysis_results):
         """
         Generates a bar graph comparing time and space complexities across different models.
@@ -0,0 +1,67 @@
+# models/parsers/__init__.py
+
+import importlib
+
+from .base import (
+    CodeStructure,
+    candidate_code_blocks,
+    estimate_complexity,
+    extract_code_block,
+    normalize_language,
+    strip_code_fences,
+)
+
+# Language -> module providing parse(code, language). Modules are imported on first use.
+PARSER_MODULES = {
+    "python": "models.parsers.python_parser",
+    "java": "models.parsers.c_family",
+    "c++": "models.parsers.c_family",
+    "javascript": "models.parsers.c_family",
+    "go": "models.parsers.c_family",
+    "swift": "models.parsers.c_family",
+    "ruby": "models.parsers.ruby_parser",
+}
+
+_loaded_parsers = {}
+
+
+def register_parser(language, module_path):
+    """
+    Registers (or replaces) the parser module used for a language.
+
+    Parameters:
+        language (str): The language name as shown in the sidebar.
+        module_path (str): Dotted path of a module exposing parse(code, language).
+    """
+    language = normalize_language(language)
+    PARSER_MODULES[language] = module_path
+    _loaded_parsers.pop(language, None)
+
+
+def get_parser(language):
+    """
+    Returns the parse function for a language, importing its module on first use.
+
+    Returns:
+        callable | None: None when no parser is registered for the language.
+    """
+    language = normalize_language(language)
+    if language not in _loaded_parsers:
+        module_path = PARSER_MODULES.get(language)
+        if module_path is None:
+            return None
+        _loaded_parsers[language] = importlib.import_module(module_path).parse
+    return _loaded_parsers[language]
+
+
+def parse_code(code, language):
+    """
+    Strips code fences from a model response and parses it into a CodeStructure.
+
+    Returns:
+        CodeStructure | None: None when the language is unsupported or the code does not parse.
+    """
+    parser = get_parser(language)
+    if parser is None:
+        return None
+    return parser(strip_code_fences(code, language), language)
@@ -0,0 +1,245 @@
+# models/parsers/base.py
+
+import re
+
+# Fence tags the models commonly use for each sidebar language
+LANGUAGE_ALIASES = {
+    "python": {"python", "python3", "py"},
+    "java": {"java"},
+    "c++": {"c++", "cpp", "cxx", "cc"},
+    "javascript": {"javascript", "js", "jsx", "node"},
+    "go": {"go", "golang"},
+    "ruby": {"ruby", "rb"},
+    "swift": {"swift"},
+}
+
+FENCE_PATTERN = re.compile(r"```[ \t]*([\w+#.-]*)[ \t]*\n(.*?)```", re.DOTALL)
+
+# Text-level halving and doubling detection shared by the parsers that do not build a syntax tree
+HALVING_PATTERN = re.compile(r"/\s*2\b|>>\s*1\b")
+HALVING_UPDATE_PATTERN = re.compile(r"\b([A-Za-z_]\w*)\s*(?:/=\s*2\b|>>=\s*1\b)")
+# i *= 2, i <<= 1, i = i * 2 and i = 2 * i
+DOUBLING_UPDATE_PATTERN = re.compile(
+    r"\b([A-Za-z_]\w*)\s*(?:\*=\s*2\b|<<=\s*1\b|=\s*(?:\1\s*(?:\*\s*2|<<\s*1)|2\s*\*\s*\1)\b)"
+)
+ASSIGNMENT_PATTERN = re.compile(r"\b([A-Za-z_]\w*)\s*(?::=|(?<![=!<>+\-*/%&|^])=(?![=~>]))([^;\n]*)")
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Za-z_]\w*\b")
+
+
+class CodeStructure:
+    """
+    Language-independent summary of the loops and recursion found in a piece of code.
+
+    Every parser reduces its source to this shape so the complexity heuristics
+    only have to be written once. Loop nesting is recorded as the heaviest path of
+    (linear loops, logarithmic loops), e.g. a binary search inside a for loop is (1, 1).
+    Calls that walk a whole collection, such as sum(a) or arr.map(f), count as linear loops.
+    """
+
+    def __init__(self, max_loop_depth=0, max_log_depth=0, recursive_calls=None, halving_recursion=False,
+                 sorts=False, allocations=0, recursive_loop_depth=0, looped_recursion=None, ambiguous=False):
+        self.max_loop_depth = max_loop_depth
+        self.max_log_depth = max_log_depth
+        self.recursive_calls = recursive_calls or {}  # function name -> self-calls in its body
+        self.halving_recursion = halving_recursion  # a self-call receives a halved argument
+        self.sorts = sorts
+        self.allocations = allocations  # collections whose size grows with the input
+        self.recursive_loop_depth = recursive_loop_depth  # deepest linear loop nesting inside a recursive function
+        # A self-call made inside a loop of its own function: "subsets" when it passes the loop
+        # variable on (backtrack(i + 1)), "permutations" when every iteration recurses on the rest
+        self.looped_recursion = looped_recursion
+        self.ambiguous = ambiguous  # the heuristics cannot tell, so the model should be asked
+
+    def record_loops(self, linear, halving):
+        # Keep the heaviest nesting path, comparing linear loops before logarithmic ones
+        if (linear, halving) > (self.max_loop_depth, self.max_log_depth):
+            self.max_loop_depth, self.max_log_depth = linear, halving
+
+    def record_looped_recursion(self, kind):
+        # Permutations grow faster than subsets, so they win
+        if self.looped_recursion != "permutations":
+            self.looped_recursion = kind
+
+    def __repr__(self):
+        return (
+            f"CodeStructure(max_loop_depth={self.max_loop_depth}, max_log_depth={self.max_log_depth}, "
+            f"recursive_calls={self.recursive_calls}, halving_recursion={self.halving_recursion}, "
+            f"sorts={self.sorts}, allocations={self.allocations}, "
+            f"recursive_loop_depth={self.recursive_loop_depth}, looped_recursion={self.looped_recursion!r}, "
+            f"ambiguous={self.ambiguous})"
+        )
+
+
+def halved_names(body):
+    # Names assigned from a halving expression, e.g. mid = (lo + hi) / 2
+    return {name for name, value in ASSIGNMENT_PATTERN.findall(body) if HALVING_PATTERN.search(value)}
+
+
+def mentions_halving(text, halved):
+    return bool(HALVING_PATTERN.search(text)) or any(re.search(rf"\b{re.escape(name)}\b", text) for name in halved)
+
+
+def is_logarithmic_loop(header, body):
+    """
+    A loop runs a logarithmic number of times when its header halves or doubles a variable
+    (i /= 2, i *= 2), or when a name in its header is halved, doubled, or reassigned from a
+    halved value inside the body.
+
+    Parameters:
+        header (str): The loop keyword and condition, up to the start of the body.
+        body (str): The loop body.
+    """
+    if HALVING_UPDATE_PATTERN.search(header) or DOUBLING_UPDATE_PATTERN.search(header):
+        return True
+    if any(HALVING_PATTERN.search(value) for _, value in ASSIGNMENT_PATTERN.findall(header)):
+        return True
+    bounds = set(IDENTIFIER_PATTERN.findall(header))
+    if bounds & set(HALVING_UPDATE_PATTERN.findall(body) + DOUBLING_UPDATE_PATTERN.findall(body)):
+        return True
+    halved = halved_names(body)
+    return any(name in bounds and mentions_halving(value, halved) for name, value in ASSIGNMENT_PATTERN.findall(body))
+
+
+def split_arguments(arguments):
+    # Splits a call's argument list on the commas that are not nested inside brackets
+    parts, depth, current = [], 0, ""
+    for char in arguments:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def record_looped_call(structure, arguments, loop_variables, halved):
+    """
+    Classifies a self-call made inside a loop of its own function from its argument text.
+
+    Passing a loop variable as-is (dfs(child)) is usually a tree or graph walk and halved
+    arguments are divide and conquer; neither can be told from the text, so both are left
+    to the model. Otherwise the call enumerates subsets when its arguments use a loop
+    variable (backtrack(i + 1)) and permutations when they do not (permute(s, l + 1, r)).
+
+    Parameters:
+        structure (CodeStructure): Where the classification is recorded.
+        arguments (str): The text between the call's parentheses.
+        loop_variables (set): Names bound by the enclosing loop headers.
+        halved (set): Names assigned from a halving expression in the function body.
+    """
+    if mentions_halving(arguments, halved) or loop_variables & set(split_arguments(arguments)):
+        structure.ambiguous = True
+    elif loop_variables & set(IDENTIFIER_PATTERN.findall(arguments)):
+        structure.record_looped_recursion("subsets")
+    else:
+        structure.record_looped_recursion("permutations")
+
+
+def normalize_language(language):
+    return (language or "").strip().lower()
+
+
+def extract_code_block(text, language):
+    """
+    Returns the body of the first fenced block tagged with the given language, or None.
+
+    Parameters:
+        text (str): A model response, possibly containing several fenced blocks.
+        language (str): The sidebar language name, e.g. "C++".
+
+    Returns:
+        str | None: The code inside the matching fence.
+    """
+    aliases = LANGUAGE_ALIASES.get(normalize_language(language), {normalize_language(language)})
+    for tag, body in FENCE_PATTERN.findall(text):
+        if tag.lower() in aliases:
+            return body.strip()
+    return None
+
+
+def candidate_code_blocks(text, language):
+    """
+    Yields the bodies of fenced blocks tagged with the given language or left untagged.
+
+    Blocks tagged with another language (e.g. a ```bash install step) are skipped.
+    """
+    aliases = LANGUAGE_ALIASES.get(normalize_language(language), {normalize_language(language)})
+    for tag, body in FENCE_PATTERN.findall(text):
+        if not tag or tag.lower() in aliases:
+            yield tag, body.strip()
+
+
+def strip_code_fences(text, language=None):
+    """
+    Removes Markdown code fences from a model response.
+
+    Prefers a block tagged with the requested language, then the first fenced
+    block of any kind, and finally returns the trimmed text unchanged.
+    """
+    if language:
+        code = extract_code_block(text, language)
+        if code is not None:
+            return code
+    match = FENCE_PATTERN.search(text)
+    if match:
+        return match.group(2).strip()
+    return text.strip()
+
+
+def estimate_complexity(structure):
+    """
+    Maps a CodeStructure onto Big O strings understood by O1Analyzer.parse_complexity.
+
+    Parameters:
+        structure (CodeStructure): The parsed summary of the code.
+
+    Returns:
+        tuple | None: (time_complexity, space_complexity), or None when the structure is
+        ambiguous and the model should be asked instead.
+    """
+    if structure.ambiguous:
+        return None
+
+    recursive = bool(structure.recursive_calls)
+    branching = any(calls >= 2 for calls in structure.recursive_calls.values())
+
+    if structure.looped_recursion == "permutations":
+        time_complexity = "O(n!)"
+    elif structure.looped_recursion == "subsets":
+        time_complexity = "O(2^n)"
+    elif branching:
+        time_complexity = "O(n log n)" if structure.halving_recursion else "O(2^n)"
+    else:
+        # Loops, single recursion and sorting each contribute a (linear, logarithmic) cost; the heaviest wins
+        costs = [(structure.max_loop_depth, min(structure.max_log_depth, 1))]
+        if recursive and structure.halving_recursion:
+            costs.append((0, 1))
+        elif recursive:
+            # n nested calls, each running the loops in the function body
+            costs.append((structure.recursive_loop_depth + 1, 0))
+        if structure.sorts:
+            costs.append((1, 1))
+        linear, halving = max(costs)
+        if linear >= 3:
+            time_complexity = "O(n^3)"
+        elif linear == 2:
+            time_complexity = "O(n^2)"
+        elif linear == 1:
+            time_complexity = "O(n log n)" if halving else "O(n)"
+        else:
+            time_complexity = "O(log n)" if halving else "O(1)"
+
+    if structure.allocations or (recursive and not structure.halving_recursion):
+        space_complexity = "O(n)"
+    elif recursive:
+        space_complexity = "O(log n)"
+    else:
+        space_complexity = "O(1)"
+
+    return time_complexity, space_complexity
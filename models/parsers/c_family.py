@@ -0,0 +1,273 @@
+# models/parsers/c_family.py
+
+import re
+
+from .base import (
+    IDENTIFIER_PATTERN,
+    CodeStructure,
+    halved_names,
+    is_logarithmic_loop,
+    mentions_halving,
+    normalize_language,
+    record_looped_call,
+)
+
+# Comments and string literals are blanked out before scanning so braces inside them are ignored
+NOISE_PATTERN = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"\"\"(?:\\.|[^\\])*?\"\"\"|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`",
+    re.DOTALL,
+)
+# Loop keywords, calls that walk a whole collection (arr.map(f), Arrays.stream(a).sum(), std::accumulate)
+# and the brackets that delimit their bodies. Math.max(a, b) compares two values, so it is left out.
+TOKEN_PATTERN = re.compile(
+    r"\b(?:for|while|do|repeat)\b"
+    r"|(?<!Math)\.(?:forEach|each|map|filter|reduce|reduceRight|flatMap|some|every|findIndex|indexOf|lastIndexOf"
+    r"|includes|join|stream|sum|average|min|max|fill|reverse)\b(?=\s*[({])"
+    r"|\b(?:std::)?(?:accumulate|max_element|min_element|count_if|find_if|all_of|any_of|none_of)\b(?=\s*\()"
+    r"|[{}();]"
+)
+SORT_PATTERN = re.compile(r"\bsort(?:ed|By|With)?\b")
+
+# Collections sized by, or copied from, the input
+SIZED_ALLOCATION_PATTERN = re.compile(
+    r"\bnew\s+[\w:<>]+\s*\[\s*[A-Za-z_]"
+    r"|\bmake\s*\(\s*\[\][^,()]*,\s*[A-Za-z_]"
+    r"|\bvector\s*<[^;{}]*>\s*\w+\s*\(\s*[A-Za-z_]"
+    r"|\bnew\s+Array\s*\(\s*[A-Za-z_]|\bArray\.from\s*\("
+    r"|\bArray\s*\(\s*repeating:[^)]*count:\s*[A-Za-z_]"
+    r"|\bnew\s+(?:ArrayList|LinkedList|ArrayDeque|HashMap|HashSet|TreeMap|TreeSet|Map|Set)\s*(?:<[^>]*>)?\s*\(\s*[A-Za-z_]"
+    r"|\.(?:slice|copyOf|copyOfRange|clone|concat|map|filter)\s*\(|\[\s*\.\.\."
+)
+# Collections that grow when called inside a loop
+GROWTH_PATTERN = re.compile(
+    r"\.(?:push|push_back|emplace_back|add|put|insert|append|unshift|offer|addLast|set)\s*\(|\bappend\s*\("
+)
+# Lines that look like code rather than prose
+STATEMENT_PATTERN = re.compile(
+    r"[;{}]\s*$"
+    r"|^\s*[A-Za-z_$][\w$.]*(?:\[[^\]\n]*\])?\s*(?::=|[-+*/%&|^]?=)(?!=)"
+    r"|^\s*[A-Za-z_$][\w$.:]*\s*\([^()\n]*\)\s*$"
+    r"|^\s*(?:#include|#import|package|import|using)\b",
+    re.MULTILINE,
+)
+
+# Names bound by a loop header: i = 0, x := range a, x in a, x of arr, x : v and arrow parameters
+LOOP_VARIABLE_PATTERN = re.compile(
+    r"\b([A-Za-z_$][\w$]*)\s*(?::=|(?<![=!<>+\-*/%&|^])=(?![=>])|\bin\b|\bof\b|:(?!:))"
+    r"|\b([A-Za-z_$][\w$]*)\s*=>"
+)
+ARROW_PARAMETERS_PATTERN = re.compile(r"\(([^()]*)\)\s*=>")
+
+KEYWORDS = {"if", "for", "while", "switch", "catch", "return", "else", "do", "repeat", "guard", "sizeof", "function"}
+
+FUNCTION_PATTERNS = {
+    "java": [re.compile(r"\b([A-Za-z_]\w*)\s*\([^;{}()]*\)\s*(?:throws\s+[\w.,\s]+)?\{")],
+    "c++": [re.compile(r"\b([A-Za-z_]\w*)\s*\([^;{}()]*\)\s*(?:const\s*)?(?:noexcept\s*)?(?:->\s*[\w:<>]+\s*)?\{")],
+    "javascript": [
+        re.compile(r"\bfunction\s*\*?\s*([A-Za-z_$][\w$]*)\s*\("),
+        re.compile(r"\b([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^()]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"),
+        re.compile(r"^\s*(?:async\s+)?([A-Za-z_$][\w$]*)\s*\([^;{}()]*\)\s*\{", re.MULTILINE),
+    ],
+    "go": [re.compile(r"\bfunc\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)\s*\(")],
+    "swift": [re.compile(r"\bfunc\s+([A-Za-z_]\w*)")],
+}
+
+
+def _strip_noise(code):
+    # Keep newlines so line-anchored patterns still line up
+    return NOISE_PATTERN.sub(lambda match: re.sub(r"[^\n]", " ", match.group(0)), code)
+
+
+def _is_balanced(code):
+    pairs = {")": "(", "}": "{", "]": "["}
+    stack = []
+    for char in code:
+        if char in "({[":
+            stack.append(char)
+        elif char in pairs:
+            if not stack or stack.pop() != pairs[char]:
+                return False
+    return not stack
+
+
+def _block_end(code, start, opener="{", closer="}"):
+    depth = 0
+    for index in range(start, len(code)):
+        if code[index] == opener:
+            depth += 1
+        elif code[index] == closer:
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(code)
+
+
+def _expression_end(code, start):
+    # End of an expression-bodied arrow function: the first ; or newline outside brackets
+    depth = 0
+    for index in range(start, len(code)):
+        char = code[index]
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if depth == 0:
+                return index
+            depth -= 1
+        elif char in ";\n" and depth == 0:
+            return index
+    return len(code)
+
+
+def _loop_variables(header):
+    names = {name for match in LOOP_VARIABLE_PATTERN.finditer(header) for name in match.groups() if name}
+    for parameters in ARROW_PARAMETERS_PATTERN.findall(header):
+        names |= set(IDENTIFIER_PATTERN.findall(parameters))
+    return names - KEYWORDS
+
+
+def _scan_loops(code, language, structure):
+    """
+    Records the heaviest loop nesting path and returns every loop as (start, end, header, logarithmic).
+
+    Spans run from the loop keyword, or the iterating call, to the end of its body.
+    """
+    # Go loops always open a brace, so their "for init; cond; post" clauses must not end a pending loop
+    semicolons_end_statements = language != "go"
+    blocks = []  # (linear levels, logarithmic levels, opened by do/repeat)
+    linear_depth = halving_depth = paren_depth = 0
+    pending = []  # (keyword, position, paren depth) of loops still waiting for their body
+    loops = []
+    skip_while = False
+
+    for match in TOKEN_PATTERN.finditer(code):
+        token = match.group(0)
+        if token == "(":
+            paren_depth += 1
+        elif token == ")":
+            paren_depth = max(paren_depth - 1, 0)
+            if pending and pending[-1][0] == "each" and pending[-1][2] == paren_depth:
+                # An iterating call whose callback has no braces, e.g. arr.map(x => x * 2)
+                _, start, depth = pending.pop()
+                # Calls whose parentheses are still open and loops whose single-statement body this is enclose it
+                enclosing = [
+                    keyword for keyword, _, outer_depth in pending
+                    if (keyword == "each" and outer_depth < depth) or (keyword != "each" and outer_depth == depth)
+                ]
+                structure.record_loops(linear_depth + len(enclosing) + 1, halving_depth)
+                loops.append((start, match.end(), code[start:match.end()], False))
+        elif token == "{":
+            linear, halving = len(pending), 0
+            if pending:
+                # The brace belongs to the innermost pending loop; any outer ones have single-statement bodies
+                keyword, start, _ = pending[-1]
+                end = _block_end(code, match.start())
+                header = code[start:match.start()]
+                logarithmic = keyword not in ("do", "repeat") and is_logarithmic_loop(header, code[match.start():end])
+                if logarithmic:
+                    linear, halving = linear - 1, 1
+                loops.append((start, end, header, logarithmic))
+            blocks.append((linear, halving, any(keyword in ("do", "repeat") for keyword, _, _ in pending)))
+            linear_depth += linear
+            halving_depth += halving
+            structure.record_loops(linear_depth, halving_depth)
+            pending = []
+        elif token == "}":
+            linear, halving, was_do = blocks.pop() if blocks else (0, 0, False)
+            linear_depth -= linear
+            halving_depth -= halving
+            skip_while = was_do
+            continue
+        elif token == ";":
+            if semicolons_end_statements and paren_depth == 0 and pending:
+                # A loop with a single-statement body still counts for this statement
+                keyword, start, _ = pending[-1]
+                statement = code[pending[0][1]:match.start()]
+                logarithmic = keyword not in ("do", "repeat") and is_logarithmic_loop(code[start:match.start()], "")
+                if logarithmic:
+                    structure.record_loops(linear_depth + len(pending) - 1, halving_depth + 1)
+                else:
+                    structure.record_loops(linear_depth + len(pending), halving_depth)
+                loops.append((pending[0][1], match.start(), statement, logarithmic))
+                pending = []
+        elif token == "while" and skip_while:
+            pass
+        elif token in ("for", "while", "do", "repeat"):
+            pending.append((token, match.start(), paren_depth))
+        else:
+            pending.append(("each", match.start(), paren_depth))
+        skip_while = False
+
+    return loops
+
+
+def _function_bodies(code, language):
+    # Yields (name, body start, body) for every function definition, including expression-bodied arrows
+    for pattern in FUNCTION_PATTERNS.get(language, []):
+        for match in pattern.finditer(code):
+            name = match.group(1)
+            if name in KEYWORDS:
+                continue
+            if match.group(0).rstrip().endswith("=>"):
+                body_start = len(code) - len(code[match.end():].lstrip())
+                if code[body_start:body_start + 1] != "{":
+                    yield name, body_start, code[body_start:_expression_end(code, body_start)]
+                    continue
+            else:
+                body_start = code.find("{", match.end() - 1)
+                statement_end = code.find(";", match.end())
+                if body_start == -1 or (statement_end != -1 and statement_end < body_start):
+                    continue
+            yield name, body_start, code[body_start:_block_end(code, body_start) + 1]
+
+
+def _scan_recursion(code, language, structure, loops):
+    for name, body_start, body in _function_bodies(code, language):
+        halved = halved_names(body)
+        calls = list(re.finditer(r"(?<![\w$.])" + re.escape(name) + r"\s*\(", body))
+        if not calls:
+            continue
+        structure.recursive_calls[name] = max(structure.recursive_calls.get(name, 0), len(calls))
+        body_end = body_start + len(body)
+        function_loops = [loop for loop in loops if body_start <= loop[0] < body_end]
+        body_structure = CodeStructure()
+        _scan_loops(body, language, body_structure)
+        structure.recursive_loop_depth = max(structure.recursive_loop_depth, body_structure.max_loop_depth)
+
+        for call in calls:
+            arguments = body[call.end() - 1:_block_end(body, call.end() - 1, "(", ")") + 1]
+            if mentions_halving(arguments, halved):
+                structure.halving_recursion = True
+            position = body_start + call.start()
+            enclosing = [loop for loop in function_loops if loop[0] <= position < loop[1]]
+            if any(logarithmic for _, _, _, logarithmic in enclosing):
+                structure.ambiguous = True
+            elif enclosing:
+                # A call inside a loop is made once per iteration, so its cost compounds
+                loop_variables = set().union(*(_loop_variables(header) for _, _, header, _ in enclosing))
+                record_looped_call(structure, arguments[1:-1], loop_variables, halved)
+
+
+def parse(code, language):
+    """
+    Scans brace-delimited languages (Java, C++, JavaScript, Go, Swift) for loops and recursion.
+
+    Returns:
+        CodeStructure | None: None when the brackets do not balance or the text has no
+        function, loop or statement in it (e.g. a refusal written in prose).
+    """
+    language = normalize_language(language)
+    cleaned = _strip_noise(code)
+    if not cleaned.strip() or not _is_balanced(cleaned):
+        return None
+
+    structure = CodeStructure(sorts=bool(SORT_PATTERN.search(cleaned)))
+    loops = _scan_loops(cleaned, language, structure)
+    _scan_recursion(cleaned, language, structure, loops)
+    has_functions = any(True for _ in _function_bodies(cleaned, language))
+    if not (loops or has_functions or STATEMENT_PATTERN.search(cleaned)):
+        return None
+
+    structure.allocations = len(SIZED_ALLOCATION_PATTERN.findall(cleaned)) + sum(
+        len(GROWTH_PATTERN.findall(cleaned[start:end])) for start, end, _, _ in loops
+    )
+    return structure
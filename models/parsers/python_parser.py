@@ -0,0 +1,289 @@
+# models/parsers/python_parser.py
+
+import ast
+
+from .base import CodeStructure
+
+COPYING_CALLS = {
+    "list", "dict", "set", "tuple", "deque", "defaultdict", "Counter", "bytearray", "sorted", "nsmallest", "nlargest",
+}
+GROWING_METHODS = {"append", "appendleft", "extend", "add", "insert", "update", "setdefault"}
+# Calls that walk their whole input once
+LINEAR_PASS_CALLS = {
+    "sum", "any", "all", "map", "filter", "reduce", "list", "tuple", "set", "frozenset", "Counter",
+    "nsmallest", "nlargest", "heapify",
+}
+LINEAR_PASS_METHODS = {"join", "count", "index", "copy"}
+DICT_CONSTRUCTORS = {"dict", "defaultdict", "Counter", "OrderedDict"}
+
+
+def _is_halving(node):
+    # x // 2, x / 2 and x >> 1
+    return isinstance(node, ast.BinOp) and isinstance(node.right, ast.Constant) and (
+        (isinstance(node.op, (ast.FloorDiv, ast.Div)) and node.right.value == 2)
+        or (isinstance(node.op, ast.RShift) and node.right.value == 1)
+    )
+
+
+def _is_doubling(node, name):
+    # name * 2, 2 * name and name << 1
+    if not isinstance(node, ast.BinOp):
+        return False
+    operands = [node.left, node.right]
+    if isinstance(node.op, ast.Mult):
+        return any(isinstance(a, ast.Name) and a.id == name and isinstance(b, ast.Constant) and b.value == 2
+                   for a, b in (operands, operands[::-1]))
+    return isinstance(node.op, ast.LShift) and isinstance(node.left, ast.Name) and node.left.id == name and (
+        isinstance(node.right, ast.Constant) and node.right.value == 1
+    )
+
+
+def _is_halving_update(node):
+    # x //= 2, x /= 2 and x >>= 1
+    return isinstance(node, ast.AugAssign) and _is_halving(ast.BinOp(left=node.target, op=node.op, right=node.value))
+
+
+def _is_doubling_update(node):
+    # x *= 2, x <<= 1, x = x * 2 and x = 2 * x
+    if isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+        return _is_doubling(ast.BinOp(left=node.target, op=node.op, right=node.value), node.target.id)
+    return isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name) and (
+        _is_doubling(node.value, node.targets[0].id)
+    )
+
+
+def _names(node):
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+def _assigned_names(node):
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return set().union(*(_names(target) for target in targets))
+
+
+def _halved_names(nodes):
+    # Names assigned from a halving expression, e.g. mid = (lo + hi) // 2
+    halved = set()
+    for node in nodes:
+        for child in ast.walk(node):
+            if isinstance(child, ast.Assign) and any(_is_halving(value) for value in ast.walk(child.value)):
+                halved |= _assigned_names(child)
+    return halved
+
+
+def _contains_halving(node, halved):
+    return any(_is_halving(child) or (isinstance(child, ast.Name) and child.id in halved) for child in ast.walk(node))
+
+
+def _is_logarithmic_loop(node):
+    """
+    A while loop runs a logarithmic number of times when a name in its condition is halved,
+    doubled, or reassigned from a halved value inside the body (binary search, n //= 2, j *= 2).
+    """
+    if not isinstance(node, ast.While):
+        return False
+    bounds = _names(node.test)
+    halved = _halved_names(node.body)
+    for statement in node.body:
+        for child in ast.walk(statement):
+            if (_is_halving_update(child) or _is_doubling_update(child)) and _assigned_names(child) & bounds:
+                return True
+            if isinstance(child, ast.Assign) and _assigned_names(child) & bounds and _contains_halving(child.value, halved):
+                return True
+    return False
+
+
+def _is_constant_iterable(node):
+    # Literal displays and range(<constant>) run a fixed number of times, e.g. the four grid directions
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return True
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "range" and (
+        all(isinstance(argument, ast.Constant) for argument in node.args)
+    )
+
+
+def _dict_names(tree):
+    # Names bound to a dict, e.g. seen = {} or counts = defaultdict(int)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            value = node.value
+            is_dict = isinstance(value, (ast.Dict, ast.DictComp)) or (
+                isinstance(value, ast.Call) and getattr(value.func, "id", getattr(value.func, "attr", None)) in DICT_CONSTRUCTORS
+            )
+            if is_dict:
+                names |= _assigned_names(node)
+    return names
+
+
+def _has_code_structure(tree):
+    # Bare names and constants parse as Python, but a sentence like `Sorry` is not code
+    return any(
+        isinstance(node, ast.stmt) and not (
+            isinstance(node, ast.Expr) and isinstance(node.value, (ast.Name, ast.Constant, ast.Attribute))
+        )
+        for node in ast.walk(tree)
+    )
+
+
+class _StructureVisitor(ast.NodeVisitor):
+    def __init__(self, dict_names=()):
+        self.structure = CodeStructure()
+        self.dict_names = set(dict_names)
+        self.linear_depth = 0
+        self.halving_depth = 0
+        self.loop_names = []  # names bound by each enclosing loop of the current function
+        self.functions = []  # enclosing function definitions, innermost last
+
+    def _record_loops(self, linear, halving):
+        self.structure.record_loops(linear, halving)
+        if self.functions:
+            function = self.functions[-1]
+            function["loop_depth"] = max(function["loop_depth"], linear)
+
+    def _visit_loop(self, node, linear, halving, names=()):
+        self.linear_depth += linear
+        self.halving_depth += halving
+        self.loop_names.append(set(names))
+        self._record_loops(self.linear_depth, self.halving_depth)
+        self.generic_visit(node)
+        self.loop_names.pop()
+        self.linear_depth -= linear
+        self.halving_depth -= halving
+
+    def visit_For(self, node):
+        if _is_constant_iterable(node.iter):
+            self.generic_visit(node)
+        else:
+            self._visit_loop(node, 1, 0, _names(node.target))
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        if _is_logarithmic_loop(node):
+            self._visit_loop(node, 0, 1)
+        else:
+            self._visit_loop(node, 1, 0)
+
+    def _visit_comprehension(self, node):
+        if not isinstance(node, ast.GeneratorExp):
+            self.structure.allocations += 1
+        names = set().union(*(_names(generator.target) for generator in node.generators))
+        self._visit_loop(node, len(node.generators), 0, names)
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    def visit_FunctionDef(self, node):
+        decorators = [ast.unparse(decorator) for decorator in node.decorator_list]
+        memoised = any("cache" in decorator for decorator in decorators)
+        self.functions.append({
+            "name": node.name, "memoised": memoised, "halved": _halved_names(node.body), "loop_depth": 0,
+        })
+        # A nested function starts with a fresh loop nesting
+        outer_loops = self.linear_depth, self.halving_depth, self.loop_names
+        self.linear_depth = self.halving_depth = 0
+        self.loop_names = []
+        self.generic_visit(node)
+        self.linear_depth, self.halving_depth, self.loop_names = outer_loops
+        function = self.functions.pop()
+        if function["name"] in self.structure.recursive_calls:
+            self.structure.recursive_loop_depth = max(self.structure.recursive_loop_depth, function["loop_depth"])
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _visit_self_call(self, node, function):
+        name = function["name"]
+        calls = self.structure.recursive_calls
+        # Memoised functions solve each subproblem once, so they never branch exponentially
+        calls[name] = 1 if function["memoised"] else calls.get(name, 0) + 1
+        halving = any(_contains_halving(argument, function["halved"]) for argument in node.args)
+        if halving:
+            self.structure.halving_recursion = True
+        if not (self.linear_depth or self.halving_depth):
+            return
+
+        # A call inside a loop is made once per iteration, so its cost compounds
+        loop_names = set().union(*self.loop_names)
+        arguments = node.args + [keyword.value for keyword in node.keywords]
+        if function["memoised"] or halving or self.halving_depth or any(
+            isinstance(argument, ast.Name) and argument.id in loop_names for argument in arguments
+        ):
+            # Memoised DP, divide and conquer, or a walk over a tree or graph: the loop alone cannot tell
+            self.structure.ambiguous = True
+        elif any(_names(argument) & loop_names for argument in arguments):
+            self.structure.record_looped_recursion("subsets")
+        else:
+            self.structure.record_looped_recursion("permutations")
+
+    def _is_linear_pass(self, node, name):
+        if any(isinstance(argument, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)) for argument in node.args):
+            # The comprehension is already counted as the loop
+            return False
+        if isinstance(node.func, ast.Attribute) and name in LINEAR_PASS_METHODS:
+            return True
+        if name in ("min", "max"):
+            # max(a) walks a; max(best, current) compares two values
+            return isinstance(node.func, ast.Name) and len(node.args) == 1
+        return name in LINEAR_PASS_CALLS and bool(node.args)
+
+    def visit_Call(self, node):
+        name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if self.functions and name == self.functions[-1]["name"]:
+            self._visit_self_call(node, self.functions[-1])
+        if name in ("sorted", "sort"):
+            self.structure.sorts = True
+        elif self._is_linear_pass(node, name):
+            self._record_loops(self.linear_depth + 1, self.halving_depth)
+        if name in COPYING_CALLS and node.args:
+            self.structure.allocations += 1
+        if name in GROWING_METHODS and isinstance(node.func, ast.Attribute) and self.linear_depth:
+            self.structure.allocations += 1
+        self.generic_visit(node)
+
+    def _visit_store(self, node, targets):
+        # seen[n] = i inside a loop adds a key per iteration; list stores such as a[i] = x overwrite in place
+        if self.linear_depth and any(
+            isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) and target.value.id in self.dict_names
+            for target in targets
+        ):
+            self.structure.allocations += 1
+        self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        self._visit_store(node, node.targets)
+
+    def visit_AugAssign(self, node):
+        self._visit_store(node, [node.target])
+
+    def visit_BinOp(self, node):
+        # [0] * n sizes a list by the input
+        if isinstance(node.op, ast.Mult) and isinstance(node.left, (ast.List, ast.ListComp)):
+            self.structure.allocations += 1
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        # Slicing copies part of the input
+        if isinstance(node.slice, ast.Slice) and isinstance(node.ctx, ast.Load):
+            self.structure.allocations += 1
+        self.generic_visit(node)
+
+
+def parse(code, language="python"):
+    """
+    Parses Python source with the standard library ast module.
+
+    Returns:
+        CodeStructure | None: None when the code is not valid Python or contains no statements.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    if not _has_code_structure(tree):
+        return None
+    visitor = _StructureVisitor(_dict_names(tree))
+    visitor.visit(tree)
+    return visitor.structure
@@ -0,0 +1,184 @@
+# models/parsers/ruby_parser.py
+
+import re
+
+from .base import CodeStructure, halved_names, is_logarithmic_loop, mentions_halving, record_looped_call
+
+COMMENT_PATTERN = re.compile(r"#.*$", re.MULTILINE)
+STRING_PATTERN = re.compile(r"\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'")
+BLOCK_OPENER = re.compile(r"^(?:def|class|module|if|unless|case|begin)\b|^(?:\w+\s*=\s*)?(?:if|unless|case)\b")
+LOOP_OPENER = re.compile(r"^(?:while|until|for)\b")
+DO_BLOCK = re.compile(r"\bdo\s*(?:\|[^|]*\|)?$")
+BRACE_BLOCK = re.compile(r"\{\s*(?:\|[^|]*\|)?$")
+# Iterating methods; [a, b].max compares two literals, so calls on a literal array are left out
+ITERATOR = re.compile(
+    r"(?:(?<!\])\.(?:each\w*|times|upto|downto|step|map|flat_map|filter_map|select|filter|reject|reduce|inject|sum"
+    r"|count|min|max|min_by|max_by|find|detect|any\?|all\?|none\?)(?![\w?!])|^loop\b)"
+)
+LOOP_MODIFIER = re.compile(r"\b(?:while|until)\b")
+DEF_PATTERN = re.compile(r"^def\s+(?:self\.)?([a-z_]\w*[?!]?)")
+SORT_PATTERN = re.compile(r"\.sort(?:_by)?\b")
+# Collections sized by, or copied from, the input
+SIZED_ALLOCATION_PATTERN = re.compile(
+    r"\bArray\.new\(\s*[a-z_]|\]\s*\*\s*[a-z_]|\w\[[^\]\n]*\.\.[^\]\n]*\]"
+    r"|\.(?:map|select|reject|dup|clone|to_a|zip|sort|sort_by)\b(?![!?])"
+)
+# Collections that grow when used inside a loop
+GROWTH_PATTERN = re.compile(r"<<|\.(?:push|append|unshift|insert|store|add)\b")
+# Hashes, whose keyed stores (seen[n] = i) grow inside a loop where array stores overwrite in place
+HASH_PATTERN = re.compile(r"^@?([a-z_]\w*)\s*=\s*(?:\{\s*\}|\{[^{}]*=>|Hash\.new\b)", re.MULTILINE)
+KEYED_STORE_PATTERN = re.compile(r"(?<![\w@.])(@?[a-z_]\w*)\[[^\]\n]*\]\s*(?:\|\||[-+*/])?=(?![=~>])")
+LOOP_VARIABLE_PATTERN = re.compile(r"\|([^|]*)\||^for\s+([\w\s,]+?)\s+in\b")
+IDENTIFIER_PATTERN = re.compile(r"[a-z_]\w*")
+# The arguments of a call, with or without parentheses
+ARGUMENTS_PATTERN = re.compile(r"\s*\(((?:[^()]|\([^()]*\))*)\)|\s+([^{}\n]*)")
+# Lines that look like code rather than prose
+STATEMENT_PATTERN = re.compile(
+    r"^[@$]?[A-Za-z_][\w.]*(?:\[[^\]]*\])?\s*(?:[-+*/|&]{0,2}=)(?![=~>])"
+    r"|^[a-z_]\w*(?:(?:\.[a-z_]\w*[?!]?)+(?:\(.*\))?|\(.*\))$"
+    r"|^(?:puts|print|p|pp|require|require_relative|return|raise|yield)(?:\s|\(|$)"
+)
+
+
+def _clean_lines(code):
+    code = STRING_PATTERN.sub('""', code)
+    code = COMMENT_PATTERN.sub("", code)
+    return [line.strip() for line in code.splitlines()]
+
+
+def _pair_blocks(lines):
+    """
+    Pairs every block opener with its `end` or `}`.
+
+    Returns:
+        tuple | None: (blocks, one_line_loops) where blocks are (start, end, is_loop, function name)
+        line spans and one_line_loops are the indexes of single-line iterators and loop modifiers.
+        None when openers and closers do not pair up.
+    """
+    open_blocks = []  # (closer, start, is_loop, function name or None)
+    blocks = []
+    one_line_loops = []
+
+    for index, line in enumerate(lines):
+        if not line:
+            continue
+
+        if line == "end" or line.startswith("end ") or line.startswith("end.") or line.startswith("}"):
+            if not open_blocks:
+                return None
+            closer, start, is_loop, name = open_blocks.pop()
+            if not line.startswith(closer):
+                return None
+            blocks.append((start, index, is_loop, name))
+            continue
+
+        is_iterator = bool(ITERATOR.search(line))
+        opener = None
+        if LOOP_OPENER.match(line):
+            opener, is_loop = "end", True
+        elif DO_BLOCK.search(line):
+            opener, is_loop = "end", is_iterator
+        elif BRACE_BLOCK.search(line):
+            opener, is_loop = "}", is_iterator
+        elif BLOCK_OPENER.match(line):
+            opener, is_loop = "end", False
+
+        if opener == "end" and re.search(r"\bend$", line):
+            # Single-line blocks such as `def empty; end` open and close on the same line
+            opener = None
+
+        if opener:
+            match = DEF_PATTERN.match(line)
+            open_blocks.append((opener, index, is_loop, match.group(1) if match else None))
+        elif is_iterator or LOOP_MODIFIER.search(line):
+            one_line_loops.append(index)
+
+    if open_blocks:
+        return None
+    return blocks, one_line_loops
+
+
+def _loop_variables(line):
+    return {
+        name for match in LOOP_VARIABLE_PATTERN.finditer(line) for group in match.groups() if group
+        for name in IDENTIFIER_PATTERN.findall(group)
+    }
+
+
+def _keyed_stores(text, hashes):
+    return sum(1 for name in KEYED_STORE_PATTERN.findall(text) if name.lstrip("@") in hashes)
+
+
+def parse(code, language="ruby"):
+    """
+    Scans Ruby source line by line, pairing block openers with their `end` or `}`.
+
+    Returns:
+        CodeStructure | None: None when openers and closers do not pair up, or when the
+        text has no block, loop or statement in it (e.g. a refusal written in prose).
+    """
+    lines = _clean_lines(code)
+    paired = _pair_blocks(lines)
+    if paired is None:
+        return None
+    blocks, one_line_loops = paired
+    if not (blocks or one_line_loops or any(STATEMENT_PATTERN.search(line) for line in lines)):
+        return None
+
+    cleaned = "\n".join(lines)
+    hashes = set(HASH_PATTERN.findall(cleaned))
+    structure = CodeStructure(
+        sorts=bool(SORT_PATTERN.search(cleaned)),
+        allocations=len(SIZED_ALLOCATION_PATTERN.findall(cleaned)),
+    )
+
+    loops = []  # (start, end, is_logarithmic)
+    for start, end, is_loop, _ in blocks:
+        if is_loop:
+            body = "\n".join(lines[start + 1:end])
+            loops.append((start, end, is_logarithmic_loop(lines[start], body)))
+            structure.allocations += len(GROWTH_PATTERN.findall(body)) + _keyed_stores(body, hashes)
+    for index in one_line_loops:
+        structure.allocations += len(GROWTH_PATTERN.findall(lines[index])) + _keyed_stores(lines[index], hashes)
+
+    # Each loop's nesting path is itself plus every loop whose span encloses it
+    loop_depths = []  # (line, linear loops on its nesting path)
+    for start, end, _ in loops:
+        enclosing = [halving for outer_start, outer_end, halving in loops if outer_start <= start and end <= outer_end]
+        structure.record_loops(enclosing.count(False), enclosing.count(True))
+        loop_depths.append((start, enclosing.count(False)))
+    for index in one_line_loops:
+        enclosing = [halving for start, end, halving in loops if start < index < end]
+        structure.record_loops(enclosing.count(False) + 1, enclosing.count(True))
+        loop_depths.append((index, enclosing.count(False) + 1))
+
+    for start, end, _, name in blocks:
+        if not name:
+            continue
+        halved = halved_names("\n".join(lines[start + 1:end]))
+        call = re.compile(r"(?<![\w.])" + re.escape(name) + r"(?![\w?!])")
+        count = 0
+        for index in range(start + 1, end):
+            line = lines[index]
+            for match in call.finditer(line):
+                count += 1
+                arguments = ARGUMENTS_PATTERN.match(line, match.end())
+                arguments = next((group for group in arguments.groups() if group), "") if arguments else ""
+                if mentions_halving(line[match.end():], halved):
+                    structure.halving_recursion = True
+                enclosing = [loop for loop in loops if start < loop[0] < index < loop[1]]
+                if any(halving for _, _, halving in enclosing):
+                    structure.ambiguous = True
+                elif enclosing or index in one_line_loops:
+                    # A call inside a loop is made once per iteration, so its cost compounds
+                    headers = [lines[loop_start] for loop_start, _, _ in enclosing]
+                    if index in one_line_loops:
+                        headers.append(line[:match.start()])
+                    loop_variables = set().union(*(_loop_variables(header) for header in headers))
+                    record_looped_call(structure, arguments, loop_variables, halved)
+        if count:
+            structure.recursive_calls[name] = count
+            function_depths = [depth for loop_start, depth in loop_depths if start < loop_start < end]
+            structure.recursive_loop_depth = max([structure.recursive_loop_depth] + function_depths)
+
+    return structure
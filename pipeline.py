@@ -0,0 +1,328 @@
+# pipeline.py
+
+import asyncio
+from collections import OrderedDict
+
+from models.o1_preview import O1PreviewModel
+from models.o1_mini import O1MiniModel
+from models.llama import LlamaModel
+from models.gemini_model import GeminiModel
+from models.gpt4o_model import GPT4oModel
+from models.mistral_model import MistralModel
+from models.llama_3_2_model import Llama32Model
+from models.o1_analyzer import O1Analyzer
+from models.parsers import candidate_code_blocks, get_parser
+
+DEFAULT_MODEL = "o1-preview"
+DEFAULT_RACE_MODELS = ["o1-mini", "gpt4o", "llama-3-2"]
+DEFAULT_MAX_RACE_MODELS = 3
+DEFAULT_CACHE_ENTRIES = 256
+
+
+class StageCache:
+    """
+    Memoizes pipeline stage results keyed by the stage name and its inputs.
+
+    The stages form a chain (process -> generate -> explain -> analyze), so a stage is only
+    recomputed when one of its own inputs changes. Only successful results are stored, and
+    the least recently used entries are evicted once max_entries is reached. Model stages
+    are keyed by the registry model name, e.g. ("generate", ("gpt4o", instruction)).
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.in_flight = {}  # (stage, key) -> [task, number of callers awaiting it]
+
+    def get(self, stage, key):
+        entry = (stage, key)
+        if entry in self.entries:
+            self.entries.move_to_end(entry)
+            return self.entries[entry]
+        return None
+
+    def set(self, stage, key, value):
+        self.entries[(stage, key)] = value
+        self.entries.move_to_end((stage, key))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def aget(self, stage, key, compute, fresh=False):
+        """
+        Returns the cached value for (stage, key), awaiting compute() on a miss.
+
+        Concurrent misses for the same entry share one call instead of each hitting the API.
+        The call itself is cancelled only once every caller awaiting it has been cancelled.
+        With fresh=True the cache is bypassed and the new value replaces the stored one.
+        """
+        if fresh:
+            value = await compute()
+            self.set(stage, key, value)
+            return value
+        value = self.get(stage, key)
+        if value is not None:
+            return value
+        entry = (stage, key)
+        if entry not in self.in_flight:
+            task = asyncio.ensure_future(compute())
+            task.add_done_callback(lambda _: self.in_flight.pop(entry, None))
+            self.in_flight[entry] = [task, 0]
+        waiting = self.in_flight[entry]
+        task = waiting[0]
+        waiting[1] += 1
+        try:
+            # Shielded so one cancelled caller does not cancel the call other callers are waiting on
+            value = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            waiting[1] -= 1
+            if waiting[1] == 0:
+                task.cancel()
+            raise
+        self.set(stage, key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+
+class Pipeline:
+    """
+    The question -> code -> explanation -> analysis chain shared by the Streamlit app and the API server.
+
+    Parameters:
+        secrets (Mapping): API keys laid out like .streamlit/secrets.toml, e.g. secrets["openai"]["api_key"].
+        cache (StageCache): Where stage results are memoized. Pass one kept in st.session_state
+            to reuse results across Streamlit reruns; defaults to a new cache.
+    """
+
+    def __init__(self, secrets, cache=None):
+        self.cache = cache if cache is not None else StageCache()
+
+        # Initialize the Llama client used to preprocess questions
+        self.llama_model = LlamaModel(
+            api_key=secrets["together"]["api_key"],
+            base_url="https://api.aimlapi.com/v1"
+        )
+
+        # Initialize the code generation models, keyed by the names used in the UI and API
+        self.models = {
+            "o1-preview": O1PreviewModel(
+                api_key=secrets["openai"]["api_key"],
+                base_url="https://api.aimlapi.com"
+            ),
+            "o1-mini": O1MiniModel(
+                api_key=secrets["openai_mini"]["api_key"],
+                base_url="https://api.aimlapi.com"
+            ),
+            "gemini-1.5-pro": GeminiModel(
+                api_key=secrets["gemini"]["api_key"],
+                base_url="https://api.aimlapi.com"
+            ),
+            "gpt4o": GPT4oModel(
+                api_key=secrets["gpt4o"]["api_key"],
+                base_url="https://api.aimlapi.com"
+            ),
+            "mistral": MistralModel(
+                api_key=secrets["mistral"]["api_key"],
+                base_url="https://api.aimlapi.com"
+            ),
+            "llama-3-2": Llama32Model(
+                api_key=secrets["mistral"]["api_key"],
+                base_url="https://api.aimlapi.com/v1"
+            ),
+        }
+
+        # Initialize the O1Analyzer
+        self.analyzer = O1Analyzer(
+            api_key=secrets["openai"]["api_key"],
+            base_url="https://api.aimlapi.com"
+        )
+
+    def resolve_model_name(self, model_name):
+        # Unknown names fall back to the default model
+        return model_name if model_name in self.models else DEFAULT_MODEL
+
+    def generation_instruction(self, processed_string, language):
+        return (
+            f"As a highly skilled software engineer, please analyze the following question thoroughly and provide optimized "
+            f"{language} code for the problem: {processed_string}. Make sure to give only code."
+        )
+
+    def explanation_instruction(self, code):
+        return (
+            f"As a highly skilled software engineer, please provide a detailed line-by-line explanation of the following code:\n\n"
+            f"{code}\n\nMake sure to explain what each line does and why it is used."
+        )
+
+    async def aprocess_question(self, user_question, fresh=False):
+        # Preprocessing depends only on the question, so it survives language and model changes
+        return await self.cache.aget(
+            "process", (user_question,),
+            lambda: self.llama_model.aprocess_question(user_question),
+            fresh=fresh
+        )
+
+    async def agenerate_code(self, user_question, language, model_name, fresh=False):
+        # Preprocess the question with Llama, then have the selected model write the code
+        processed_string = await self.aprocess_question(user_question, fresh=fresh)
+        instruction = self.generation_instruction(processed_string, language)
+        return await self.agenerate_from_instruction(instruction, model_name, fresh=fresh)
+
+    async def agenerate_from_instruction(self, instruction, model_name, fresh=False):
+        # Shared by single-model runs and racers, so both hit the same "generate" cache entries
+        model_name = self.resolve_model_name(model_name)
+        model_instance = self.models[model_name]
+        return await self.cache.aget(
+            "generate", (model_name, instruction),
+            lambda: model_instance.agenerate_code(instruction),
+            fresh=fresh
+        )
+
+    async def aexplain_code(self, code, model_name, fresh=False):
+        # Have the selected model explain the generated code line by line
+        model_name = self.resolve_model_name(model_name)
+        model_instance = self.models[model_name]
+        instruction = self.explanation_instruction(code)
+        return await self.cache.aget(
+            "explain", (model_name, instruction),
+            lambda: model_instance.aexplain_code(instruction),
+            fresh=fresh
+        )
+
+    async def aanalyze_complexity(self, code_snippets, language=None, local=False, fresh=False):
+        """
+        Cached wrapper around O1Analyzer.aanalyze_complexity.
+
+        Only snippets whose label, code, language or analysis mode changed are sent to the
+        analyzer, unless fresh is set, in which case every snippet is analyzed again.
+        """
+        analysis_results = {}
+        missing = {}
+        for model_key, code in code_snippets.items():
+            cached = None if fresh else self.cache.get("analyze", (model_key, code, language, local))
+            if cached is not None:
+                analysis_results[model_key] = cached
+            else:
+                missing[model_key] = code
+
+        if missing:
+            fresh_results = await self.analyzer.aanalyze_complexity(missing, language=language, local=local)
+            for model_key, complexities in fresh_results.items():
+                if complexities["error"] is None:
+                    self.cache.set("analyze", (model_key, missing[model_key], language, local), complexities)
+            analysis_results.update(fresh_results)
+
+        # Keep the caller's ordering for the graph
+        return {model_key: analysis_results[model_key] for model_key in code_snippets}
+
+    async def agenerate_and_explain(self, model_name, user_question, language, fresh=False):
+        try:
+            code = await self.agenerate_code(user_question, language, model_name, fresh=fresh)
+            explanation = await self.aexplain_code(code, model_name, fresh=fresh)
+            return {
+                "model_name": model_name,
+                "code": code,
+                "explanation": explanation
+            }
+        except Exception as e:
+            return {
+                "model_name": model_name,
+                "code": "Error generating code.",
+                "explanation": f"Error: {e}"
+            }
+
+    async def arun_models(self, user_question, language, model_names, fresh=False):
+        # Run every selected model on one event loop; model_names maps result keys to model names
+        results = await asyncio.gather(*(
+            self.agenerate_and_explain(model_name, user_question, language, fresh=fresh)
+            for model_name in model_names.values()
+        ))
+        return dict(zip(model_names, results))
+
+    def is_valid_response(self, response, language):
+        """
+        Cheap local check used by race mode: the response must contain code in the requested language.
+
+        A fenced block tagged with the language, or left untagged, must parse and contain a
+        real code construct (function, loop, statement or block). Unfenced prose such as a
+        refusal never passes. For languages without a parser a non-empty tagged block is enough.
+        """
+        parser = get_parser(language)
+        for tag, code in candidate_code_blocks(response, language):
+            if parser is None:
+                if tag and code:
+                    return True
+            elif parser(code, language) is not None:
+                return True
+        return False
+
+    async def arace_models(self, user_question, language, model_names=None, max_models=DEFAULT_MAX_RACE_MODELS,
+                           fresh=False):
+        """
+        Sends the same instruction to several models at once and keeps the first valid answer.
+
+        Racers go through the "generate" stage cache, so a resubmitted question reuses earlier
+        answers and a model that is also being compared is only called once. The remaining
+        requests are cancelled as soon as a winner is found, and the winner alone explains its code.
+
+        Parameters:
+            user_question (str): The question as typed by the user.
+            language (str): The language the code must be written in.
+            model_names (list): Models to race. Defaults to DEFAULT_RACE_MODELS.
+            max_models (int): Cost cap; at most this many models are called.
+            fresh (bool): Bypass cached answers and ask every racer again.
+
+        Returns:
+            dict: model_name, code and explanation of the winner, plus the models that were raced.
+
+        Raises:
+            ValueError: If max_models is below 1 or a model name is not registered.
+            RuntimeError: If no racer returned anything; the message lists each racer's error.
+                Errors from preprocessing the question or explaining the winner propagate as-is.
+        """
+        if max_models < 1:
+            raise ValueError("max_models must be at least 1.")
+        raced = list(model_names or DEFAULT_RACE_MODELS)[:max_models]
+        unknown = [model_name for model_name in raced if model_name not in self.models]
+        if unknown:
+            raise ValueError(f"Unknown model(s): {', '.join(map(repr, unknown))}")
+
+        fallback = None
+        failures = []  # provider errors, reported if no racer returns anything
+        # The question is preprocessed once and shared by every racer
+        processed_string = await self.aprocess_question(user_question, fresh=fresh)
+        instruction = self.generation_instruction(processed_string, language)
+
+        pending = {
+            asyncio.create_task(self.agenerate_from_instruction(instruction, model_name, fresh=fresh)): model_name
+            for model_name in raced
+        }
+        winner = None
+        try:
+            while pending and winner is None:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model_name = pending.pop(task)
+                    if task.exception() is not None:
+                        failures.append(f"{model_name}: {task.exception()}")
+                        continue
+                    if self.is_valid_response(task.result(), language):
+                        winner = (model_name, task.result())
+                        break
+                    # Keep the first well-formed but invalid answer in case nobody passes the check
+                    fallback = fallback or (model_name, task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None and fallback is None:
+            raise RuntimeError(f"No model returned code. {'; '.join(failures)}")
+        model_name, code = winner or fallback
+        explanation = await self.aexplain_code(code, model_name, fresh=fresh)
+        return {
+            "model_name": model_name,
+            "code": code,
+            "explanation": explanation,
+            "raced": raced
+        }
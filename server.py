@@ -0,0 +1,236 @@
+# server.py
+#
+# ASGI service exposing the generate/explain/analyze pipeline as JSON and SSE endpoints.
+# Stage results are memoized per worker; send "fresh": true to bypass the cache for a request.
+# Run with `python server.py` (HOST, PORT and WORKERS environment variables) or any
+# ASGI server, e.g. `uvicorn server:app --workers 4`.
+
+import contextlib
+import json
+import os
+import tomllib
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from pipeline import DEFAULT_MAX_RACE_MODELS, DEFAULT_MODEL, Pipeline
+
+SECRETS_PATH = os.environ.get("SECRETS_PATH", ".streamlit/secrets.toml")
+
+
+def load_secrets(path=SECRETS_PATH):
+    # Reuse the Streamlit secrets file so both entry points share one configuration
+    with open(path, "rb") as secrets_file:
+        return tomllib.load(secrets_file)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Build the clients once per worker so connections stay warm between requests
+    app.state.pipeline = Pipeline(load_secrets())
+    yield
+
+
+async def read_payload(request, *required):
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be valid JSON.")
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object.")
+    missing = [field for field in required if not payload.get(field)]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+    return payload
+
+
+def require_strings(payload, *fields):
+    # Optional fields may be absent, but when present they must be strings
+    for field in fields:
+        if field in payload and not isinstance(payload[field], str):
+            raise ValueError(f"{field} must be a string.")
+
+
+def require_booleans(payload, *fields):
+    # Flags must be JSON booleans; bool("false") would otherwise switch them on
+    for field in fields:
+        if field in payload and not isinstance(payload[field], bool):
+            raise ValueError(f"{field} must be true or false.")
+
+
+def requested_model(pipeline, payload):
+    model_name = payload.get("model", DEFAULT_MODEL)
+    if not isinstance(model_name, str) or model_name not in pipeline.models:
+        raise ValueError(f"Unknown model: {model_name!r}. Available models: {', '.join(pipeline.models)}")
+    return model_name
+
+
+def requested_race_models(pipeline, payload):
+    model_names = payload.get("models")
+    if model_names is None:
+        return None
+    if not isinstance(model_names, list) or not model_names:
+        raise ValueError("models must be a non-empty list of model names.")
+    unknown = [name for name in model_names if not isinstance(name, str) or name not in pipeline.models]
+    if unknown:
+        raise ValueError(f"Unknown model(s): {', '.join(map(repr, unknown))}. Available models: {', '.join(pipeline.models)}")
+    return model_names
+
+
+def requested_max_models(payload):
+    max_models = payload.get("max_models", DEFAULT_MAX_RACE_MODELS)
+    # bool is a subclass of int, so reject it explicitly
+    if not isinstance(max_models, int) or isinstance(max_models, bool) or max_models < 1:
+        raise ValueError("max_models must be an integer of at least 1.")
+    return max_models
+
+
+def error_response(error, status_code=400):
+    return JSONResponse({"error": str(error)}, status_code=status_code)
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def generate(request):
+    pipeline = request.app.state.pipeline
+    try:
+        payload = await read_payload(request, "question", "language")
+        require_strings(payload, "question", "language")
+        require_booleans(payload, "fresh")
+        model_name = requested_model(pipeline, payload)
+    except ValueError as e:
+        return error_response(e)
+
+    try:
+        code = await pipeline.agenerate_code(
+            payload["question"], payload["language"], model_name, fresh=payload.get("fresh", False)
+        )
+    except Exception as e:
+        return error_response(e, status_code=502)
+    return JSONResponse({"model_name": model_name, "code": code})
+
+
+async def explain(request):
+    pipeline = request.app.state.pipeline
+    try:
+        payload = await read_payload(request, "code")
+        require_strings(payload, "code")
+        require_booleans(payload, "fresh")
+        model_name = requested_model(pipeline, payload)
+    except ValueError as e:
+        return error_response(e)
+
+    try:
+        explanation = await pipeline.aexplain_code(payload["code"], model_name, fresh=payload.get("fresh", False))
+    except Exception as e:
+        return error_response(e, status_code=502)
+    return JSONResponse({"model_name": model_name, "explanation": explanation})
+
+
+async def analyze(request):
+    try:
+        payload = await read_payload(request, "code_snippets")
+        require_strings(payload, "language")
+        require_booleans(payload, "local", "fresh")
+    except ValueError as e:
+        return error_response(e)
+    code_snippets = payload["code_snippets"]
+    if not isinstance(code_snippets, dict) or not all(isinstance(code, str) for code in code_snippets.values()):
+        return error_response("code_snippets must map model names to code strings.")
+
+    # analyze_complexity already reports per-snippet errors in its results
+    analysis_results = await request.app.state.pipeline.aanalyze_complexity(
+        code_snippets, language=payload.get("language"), local=payload.get("local", False),
+        fresh=payload.get("fresh", False)
+    )
+    return JSONResponse(analysis_results)
+
+
+async def race(request):
+    pipeline = request.app.state.pipeline
+    try:
+        payload = await read_payload(request, "question", "language")
+        require_strings(payload, "question", "language")
+        require_booleans(payload, "fresh")
+        model_names = requested_race_models(pipeline, payload)
+        max_models = requested_max_models(payload)
+    except ValueError as e:
+        return error_response(e)
+
+    try:
+        result = await pipeline.arace_models(
+            payload["question"], payload["language"], model_names,
+            max_models=max_models, fresh=payload.get("fresh", False)
+        )
+    except Exception as e:
+        return error_response(e, status_code=502)
+    return JSONResponse(result)
+
+
+async def stream(request):
+    """
+    Runs the whole pipeline for one model and streams each stage as a Server-Sent Event.
+
+    Events are emitted in order: code, explanation, analysis, done. A failing stage
+    emits an error event and ends the stream.
+    """
+    pipeline = request.app.state.pipeline
+    try:
+        payload = await read_payload(request, "question", "language")
+        require_strings(payload, "question", "language")
+        require_booleans(payload, "local", "fresh")
+        model_name = requested_model(pipeline, payload)
+    except ValueError as e:
+        return error_response(e)
+
+    language = payload["language"]
+    fresh = payload.get("fresh", False)
+
+    async def events():
+        try:
+            code = await pipeline.agenerate_code(payload["question"], language, model_name, fresh=fresh)
+            yield sse_event("code", {"model_name": model_name, "code": code})
+
+            explanation = await pipeline.aexplain_code(code, model_name, fresh=fresh)
+            yield sse_event("explanation", {"model_name": model_name, "explanation": explanation})
+        except Exception as e:
+            yield sse_event("error", {"model_name": model_name, "error": str(e)})
+            return
+
+        analysis_results = await pipeline.aanalyze_complexity(
+            {model_name: code}, language=language, local=payload.get("local", False), fresh=fresh
+        )
+        yield sse_event("analysis", analysis_results[model_name])
+        yield sse_event("done", {"model_name": model_name})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/generate", generate, methods=["POST"]),
+        Route("/explain", explain, methods=["POST"]),
+        Route("/analyze", analyze, methods=["POST"]),
+        Route("/race", race, methods=["POST"]),
+        Route("/stream", stream, methods=["POST"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "server:app",
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=int(os.environ.get("WORKERS", "1")),
+    )
@@ -0,0 +1,76 @@
+# tests/conftest.py
+#
+# Fakes shared by the pipeline and server tests, so no test reaches a real API.
+
+import asyncio
+
+import pytest
+
+from pipeline import Pipeline
+
+SECRETS = {
+    section: {"api_key": "test-key"}
+    for section in ("together", "openai", "openai_mini", "gemini", "gpt4o", "mistral")
+}
+
+
+class FakeModel:
+    def __init__(self, name, response=None, error=None, delay=0):
+        self.name = name
+        self.response = response if response is not None else f"```python\nprint({name!r})\n```"
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+        self.explanations = 0
+        self.cancelled = False
+
+    async def agenerate_code(self, instruction):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise RuntimeError(self.error)
+        return self.response
+
+    async def aexplain_code(self, instruction):
+        self.explanations += 1
+        return f"Explained by {self.name}"
+
+
+class FakeLlama:
+    def __init__(self):
+        self.calls = 0
+
+    async def aprocess_question(self, user_question):
+        self.calls += 1
+        return user_question
+
+
+@pytest.fixture
+def secrets():
+    return SECRETS
+
+
+@pytest.fixture
+def fake_model():
+    return FakeModel
+
+
+@pytest.fixture
+def fake_pipeline(fake_model):
+    # Swaps the clients of an existing Pipeline for fakes
+    def install(pipeline):
+        pipeline.llama_model = FakeLlama()
+        for model_name in pipeline.models:
+            pipeline.models[model_name] = fake_model(model_name)
+        pipeline.analyzer.model = fake_model("analyzer")
+        return pipeline
+    return install
+
+
+@pytest.fixture
+def pipeline(secrets, fake_pipeline):
+    return fake_pipeline(Pipeline(secrets))
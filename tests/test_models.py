@@ -0,0 +1,58 @@
+# tests/test_models.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from models.gemini_model import GeminiModel
+from models.gpt4o_model import GPT4oModel
+from models.llama import LlamaModel
+from models.llama_3_2_model import Llama32Model
+from models.mistral_model import MistralModel
+from models.o1_mini import O1MiniModel
+from models.o1_preview import O1PreviewModel
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=' "print(1)"\n'))])
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **request):
+        return FakeCompletions.create(self, **request)
+
+
+def with_fake_clients(model):
+    model.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    model.async_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeAsyncCompletions()))
+    return model
+
+
+@pytest.mark.parametrize("model_class", [
+    O1PreviewModel, O1MiniModel, GeminiModel, GPT4oModel, MistralModel, Llama32Model,
+])
+@pytest.mark.parametrize("method", ["generate_code", "explain_code"])
+def test_sync_and_async_requests_match(model_class, method):
+    model = with_fake_clients(model_class(api_key="test-key"))
+
+    sync_result = getattr(model, method)("Reverse a list")
+    async_result = asyncio.run(getattr(model, "a" + method)("Reverse a list"))
+
+    assert sync_result == async_result == '"print(1)"'
+    assert model.client.chat.completions.requests == model.async_client.chat.completions.requests
+
+
+def test_llama_sync_and_async_requests_match():
+    model = with_fake_clients(LlamaModel(api_key="test-key"))
+
+    sync_result = model.process_question("Reverse a list")
+    async_result = asyncio.run(model.aprocess_question("Reverse a list"))
+
+    assert sync_result == async_result == "print(1)"
+    assert model.client.chat.completions.requests == model.async_client.chat.completions.requests
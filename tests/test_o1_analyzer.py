@@ -0,0 +1,73 @@
+# tests/test_o1_analyzer.py
+
+import asyncio
+
+from models.o1_analyzer import O1Analyzer
+
+
+class FakeModel:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.instructions = []
+
+    def generate_code(self, instruction):
+        self.instructions.append(instruction)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        return " O(n) \n" if "time complexity" in instruction else " O(1) \n"
+
+    async def agenerate_code(self, instruction):
+        return self.generate_code(instruction)
+
+
+def make_analyzer(fail=False):
+    analyzer = O1Analyzer(api_key="test-key")
+    analyzer.model = FakeModel(fail=fail)
+    return analyzer
+
+
+SNIPPETS = {
+    "Base Model": "def fib(n):\n    return n if n < 2 else fib(n - 1) + fib(n - 2)\n",
+    "gpt4o": "Error generating code.",
+    "mistral": "Sorry, I can't do that.",
+}
+
+
+def test_sync_and_async_paths_agree():
+    for local in (False, True):
+        for fail in (False, True):
+            sync_results = make_analyzer(fail).analyze_complexity(SNIPPETS, language="Python", local=local)
+            async_results = asyncio.run(
+                make_analyzer(fail).aanalyze_complexity(SNIPPETS, language="Python", local=local)
+            )
+            assert sync_results == async_results
+
+
+def test_local_analysis_falls_back_to_the_model_for_prose():
+    analyzer = make_analyzer()
+    results = analyzer.analyze_complexity(SNIPPETS, language="Python", local=True)
+
+    assert results["Base Model"] == {"time_complexity": "O(2^n)", "space_complexity": "O(n)", "error": None}
+    assert results["gpt4o"] == {"time_complexity": "N/A", "space_complexity": "N/A", "error": "Error generating code."}
+    assert results["mistral"] == {"time_complexity": "O(n)", "space_complexity": "O(1)", "error": None}
+    # Only the unparseable snippet reached the model
+    assert len(analyzer.model.instructions) == 2
+
+
+def test_ambiguous_structures_are_sent_to_the_model():
+    analyzer = make_analyzer()
+    walk = "def walk(node):\n    for child in node.children:\n        walk(child)\n"
+    results = analyzer.analyze_complexity({"Base Model": walk}, language="Python", local=True)
+
+    assert results["Base Model"] == {"time_complexity": "O(n)", "space_complexity": "O(1)", "error": None}
+    assert len(analyzer.model.instructions) == 2
+
+
+def test_model_failures_are_reported_per_snippet():
+    results = make_analyzer(fail=True).analyze_complexity({"Base Model": "x = 1"})
+
+    assert results["Base Model"] == {
+        "time_complexity": "Error analyzing time complexity.",
+        "space_complexity": "Error analyzing space complexity.",
+        "error": "provider unavailable",
+    }
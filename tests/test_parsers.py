@@ -0,0 +1,560 @@
+# tests/test_parsers.py
+
+import pytest
+
+from models.parsers import estimate_complexity, parse_code, strip_code_fences
+
+CASES = [
+    # Python
+    (
+        "Python",
+        "def fib(n):\n"
+        "    if n < 2:\n"
+        "        return n\n"
+        "    return fib(n - 1) + fib(n - 2)\n",
+        ("O(2^n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "from functools import lru_cache\n\n"
+        "@lru_cache(maxsize=None)\n"
+        "def fib(n):\n"
+        "    return n if n < 2 else fib(n - 1) + fib(n - 2)\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def pair_sums(a):\n"
+        "    total = 0\n"
+        "    for x in a:\n"
+        "        for y in a:\n"
+        "            total += x * y\n"
+        "    return total\n",
+        ("O(n^2)", "O(1)"),
+    ),
+    (
+        "Python",
+        "def search(a, target):\n"
+        "    lo, hi = 0, len(a) - 1\n"
+        "    while lo <= hi:\n"
+        "        mid = (lo + hi) // 2\n"
+        "        if a[mid] == target:\n"
+        "            return mid\n"
+        "        if a[mid] < target:\n"
+        "            lo = mid + 1\n"
+        "        else:\n"
+        "            hi = mid - 1\n"
+        "    return -1\n",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "Python",
+        "m = len(a) // 2\n"
+        "for x in a:\n"
+        "    print(x)\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Python",
+        "def total(a):\n"
+        "    s = 0\n"
+        "    for x in a:\n"
+        "        s += x\n"
+        "    return s\n\n"
+        "print(total([1, 2, 3]))\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Python",
+        "def merge_sort(a):\n"
+        "    if len(a) <= 1:\n"
+        "        return a\n"
+        "    mid = len(a) // 2\n"
+        "    left = merge_sort(a[:mid])\n"
+        "    right = merge_sort(a[mid:])\n"
+        "    return merge(left, right)\n",
+        ("O(n log n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def squares(a):\n"
+        "    return [x * x for x in a]\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def permute(nums, start=0):\n"
+        "    if start == len(nums):\n"
+        "        result.append(nums[:])\n"
+        "        return\n"
+        "    for i in range(start, len(nums)):\n"
+        "        nums[start], nums[i] = nums[i], nums[start]\n"
+        "        permute(nums, start + 1)\n"
+        "        nums[start], nums[i] = nums[i], nums[start]\n",
+        ("O(n!)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def subsets(nums, start, path):\n"
+        "    result.append(path[:])\n"
+        "    for i in range(start, len(nums)):\n"
+        "        path.append(nums[i])\n"
+        "        subsets(nums, i + 1, path)\n"
+        "        path.pop()\n",
+        ("O(2^n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def drop_first(a):\n"
+        "    if not a:\n"
+        "        return 0\n"
+        "    for x in a:\n"
+        "        print(x)\n"
+        "    return drop_first(a[1:])\n",
+        ("O(n^2)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def fill(grid, i, j):\n"
+        "    grid[i][j] = 0\n"
+        "    for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):\n"
+        "        fill(grid, i + dx, j + dy)\n",
+        ("O(n)", "O(n)"),
+    ),
+    # A walk over children, and memoised recursion inside a loop, depend on data the code does not show
+    (
+        "Python",
+        "def walk(node):\n"
+        "    for child in node.children:\n"
+        "        walk(child)\n",
+        None,
+    ),
+    (
+        "Python",
+        "from functools import lru_cache\n\n"
+        "@lru_cache(maxsize=None)\n"
+        "def fewest_coins(amount):\n"
+        "    if amount == 0:\n"
+        "        return 0\n"
+        "    return min(fewest_coins(amount - c) + 1 for c in coins if c <= amount)\n",
+        None,
+    ),
+    ("Python", "def total(a):\n    return sum(a)\n", ("O(n)", "O(1)")),
+    (
+        "Python",
+        "import heapq\n\n"
+        "def smallest(a, k):\n"
+        "    return heapq.nsmallest(k, a)\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def largest(a):\n"
+        "    best = a[0]\n"
+        "    for x in a:\n"
+        "        best = max(best, x)\n"
+        "    return best\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Python",
+        "for i in range(n):\n"
+        "    j = 1\n"
+        "    while j < n:\n"
+        "        j *= 2\n",
+        ("O(n log n)", "O(1)"),
+    ),
+    (
+        "Python",
+        "def two_sum(nums, target):\n"
+        "    seen = {}\n"
+        "    for i, n in enumerate(nums):\n"
+        "        if target - n in seen:\n"
+        "            return [seen[target - n], i]\n"
+        "        seen[n] = i\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Python",
+        "def bubble(a):\n"
+        "    for i in range(len(a)):\n"
+        "        for j in range(len(a) - i - 1):\n"
+        "            if a[j] > a[j + 1]:\n"
+        "                a[j], a[j + 1] = a[j + 1], a[j]\n",
+        ("O(n^2)", "O(1)"),
+    ),
+    # Java
+    (
+        "Java",
+        "```java\n"
+        "int m = a.length / 2;\n"
+        "for (int x : a) {\n"
+        "    System.out.println(x);\n"
+        "}\n"
+        "```",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Java",
+        "import java.util.Scanner;\n"
+        "public class Main {\n"
+        "    public static void main(String[] args) {\n"
+        "        Scanner sc = new Scanner(System.in);\n"
+        "        int n = sc.nextInt();\n"
+        "        System.out.println(n * 2);\n"
+        "    }\n"
+        "}\n",
+        ("O(1)", "O(1)"),
+    ),
+    (
+        "Java",
+        "static int factorial(int n) {\n"
+        "    if (n <= 1) return 1;\n"
+        "    return n * factorial(n - 1);\n"
+        "}\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Java",
+        "static int sum(int[] a) {\n"
+        "    int t = 0;\n"
+        "    for (int i = 0; i < a.length; i++) {\n"
+        "        for (int j = 0; j < a.length; j++) t += a[j];\n"
+        "    }\n"
+        "    return t;\n"
+        "}\n",
+        ("O(n^2)", "O(1)"),
+    ),
+    (
+        "Java",
+        "static int total(int[] nums) {\n"
+        "    return Arrays.stream(nums).sum();\n"
+        "}\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Java",
+        "static List<Integer> evens(int[] a) {\n"
+        "    List<Integer> out = new ArrayList<>();\n"
+        "    for (int x : a) {\n"
+        "        if (x % 2 == 0) out.add(x);\n"
+        "    }\n"
+        "    return out;\n"
+        "}\n",
+        ("O(n)", "O(n)"),
+    ),
+    # C++
+    (
+        "C++",
+        "```cpp\n"
+        "void merge(vector<int>& v, int l, int m, int r) {\n"
+        "    vector<int> tmp(r - l + 1);\n"
+        "    int i = l, j = m + 1, k = 0;\n"
+        "    while (i <= m && j <= r) tmp[k++] = v[i] <= v[j] ? v[i++] : v[j++];\n"
+        "}\n"
+        "void mergeSort(vector<int>& v, int l, int r) {\n"
+        "    if (l >= r) return;\n"
+        "    int m = (l + r) / 2;\n"
+        "    mergeSort(v, l, m);\n"
+        "    mergeSort(v, m + 1, r);\n"
+        "    merge(v, l, m, r);\n"
+        "}\n"
+        "```",
+        ("O(n log n)", "O(n)"),
+    ),
+    (
+        "C++",
+        "int countTriples(const vector<int>& a) {\n"
+        "    int c = 0;\n"
+        "    for (size_t i = 0; i < a.size(); i++)\n"
+        "        for (size_t j = 0; j < a.size(); j++)\n"
+        "            for (size_t k = 0; k < a.size(); k++)\n"
+        "                if (a[i] + a[j] == a[k]) c++;\n"
+        "    return c;\n"
+        "}\n",
+        ("O(n^3)", "O(1)"),
+    ),
+    (
+        "C++",
+        "int bits(int n) {\n"
+        "    int count = 0;\n"
+        "    for (int i = n; i > 0; i /= 2) count++;\n"
+        "    return count;\n"
+        "}\n",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "C++",
+        "int bits(int n) {\n"
+        "    int count = 0;\n"
+        "    for (int i = n; i > 0; i /= 2) {\n"
+        "        count++;\n"
+        "    }\n"
+        "    return count;\n"
+        "}\n",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "C++",
+        "void permute(string s, int l, int r) {\n"
+        "    if (l == r) {\n"
+        "        cout << s << endl;\n"
+        "        return;\n"
+        "    }\n"
+        "    for (int i = l; i <= r; i++) {\n"
+        "        swap(s[l], s[i]);\n"
+        "        permute(s, l + 1, r);\n"
+        "        swap(s[l], s[i]);\n"
+        "    }\n"
+        "}\n",
+        ("O(n!)", "O(n)"),
+    ),
+    (
+        "C++",
+        "int steps(int n) {\n"
+        "    int c = 0;\n"
+        "    for (int i = 0; i < n; i++)\n"
+        "        for (int j = 1; j < n; j <<= 1) c++;\n"
+        "    return c;\n"
+        "}\n",
+        ("O(n log n)", "O(1)"),
+    ),
+    # JavaScript
+    (
+        "JavaScript",
+        "const fib = (n) => n < 2 ? n : fib(n - 1) + fib(n - 2);\n",
+        ("O(2^n)", "O(n)"),
+    ),
+    (
+        "JavaScript",
+        "```js\n"
+        "function search(a, x) {\n"
+        "  let lo = 0, hi = a.length - 1;\n"
+        "  while (lo <= hi) {\n"
+        "    const m = (lo + hi) >> 1;\n"
+        "    if (a[m] === x) return m;\n"
+        "    if (a[m] < x) lo = m + 1;\n"
+        "    else hi = m - 1;\n"
+        "  }\n"
+        "  return -1;\n"
+        "}\n"
+        "```",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "JavaScript",
+        "function doubled(arr) {\n"
+        "  const result = [];\n"
+        "  arr.forEach(x => {\n"
+        "    result.push(x * 2);\n"
+        "  });\n"
+        "  return result;\n"
+        "}\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "JavaScript",
+        "function total(arr) {\n"
+        "  return arr.reduce((sum, x) => sum + x, 0);\n"
+        "}\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "JavaScript",
+        "const doubled = (arr) => arr.map(x => x * 2);\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "JavaScript",
+        "function prefixTotals(arr) {\n"
+        "  let total = 0;\n"
+        "  for (const x of arr) {\n"
+        "    total += arr.reduce((sum, y) => sum + y, 0);\n"
+        "  }\n"
+        "  return total;\n"
+        "}\n",
+        ("O(n^2)", "O(1)"),
+    ),
+    (
+        "JavaScript",
+        "const sorted = (arr) => [...arr].sort((a, b) => a - b);\n",
+        ("O(n log n)", "O(n)"),
+    ),
+    # Go
+    (
+        "Go",
+        "```go\n"
+        "func sum(a []int) int {\n"
+        "\ts := 0\n"
+        "\tfor i := 0; i < len(a); i++ {\n"
+        "\t\ts += a[i]\n"
+        "\t}\n"
+        "\treturn s\n"
+        "}\n"
+        "```",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Go",
+        "func search(a []int, x int) int {\n"
+        "\tlo, hi := 0, len(a)-1\n"
+        "\tfor lo <= hi {\n"
+        "\t\tmid := (lo + hi) / 2\n"
+        "\t\tif a[mid] < x {\n"
+        "\t\t\tlo = mid + 1\n"
+        "\t\t} else {\n"
+        "\t\t\thi = mid - 1\n"
+        "\t\t}\n"
+        "\t}\n"
+        "\treturn lo\n"
+        "}\n",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "Go",
+        "func prefix(a []int) []int {\n"
+        "\tp := make([]int, len(a)+1)\n"
+        "\tfor i, x := range a {\n"
+        "\t\tp[i+1] = p[i] + x\n"
+        "\t}\n"
+        "\treturn p\n"
+        "}\n",
+        ("O(n)", "O(n)"),
+    ),
+    # Swift
+    (
+        "Swift",
+        "```swift\n"
+        "func f(_ a: [Int]) -> Int {\n"
+        "    var c = 0\n"
+        "    repeat { c += 1 } while c < a.count\n"
+        "    for x in a { for y in a { for z in a { c += x * y * z } } }\n"
+        "    return c\n"
+        "}\n"
+        "```",
+        ("O(n^3)", "O(1)"),
+    ),
+    (
+        "Swift",
+        "func copy(_ a: [Int]) -> [Int] {\n"
+        "    var result: [Int] = []\n"
+        "    for x in a {\n"
+        "        result.append(x)\n"
+        "    }\n"
+        "    return result\n"
+        "}\n",
+        ("O(n)", "O(n)"),
+    ),
+    # Ruby
+    (
+        "Ruby",
+        "```ruby\n"
+        "def fact(n)\n"
+        "  return 1 if n <= 1\n"
+        "  n * fact(n - 1)\n"
+        "end\n"
+        "```",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Ruby",
+        "arr.each do |x|\n"
+        "  arr.each { |y| puts x * y }\n"
+        "end\n",
+        ("O(n^2)", "O(1)"),
+    ),
+    (
+        "Ruby",
+        "def search(a, x)\n"
+        "  lo, hi = 0, a.length - 1\n"
+        "  while lo <= hi\n"
+        "    mid = (lo + hi) / 2\n"
+        "    return mid if a[mid] == x\n"
+        "    if a[mid] < x\n"
+        "      lo = mid + 1\n"
+        "    else\n"
+        "      hi = mid - 1\n"
+        "    end\n"
+        "  end\n"
+        "  -1\n"
+        "end\n",
+        ("O(log n)", "O(1)"),
+    ),
+    (
+        "Ruby",
+        "mid = arr.length / 2\n"
+        "arr.each { |x| puts x }\n",
+        ("O(n)", "O(1)"),
+    ),
+    (
+        "Ruby",
+        "def two_sum(nums, target)\n"
+        "  seen = {}\n"
+        "  nums.each_with_index do |n, i|\n"
+        "    return [seen[target - n], i] if seen.key?(target - n)\n"
+        "    seen[n] = i\n"
+        "  end\n"
+        "end\n",
+        ("O(n)", "O(n)"),
+    ),
+    (
+        "Ruby",
+        "def permute(a, l)\n"
+        "  return puts(a.inspect) if l == a.size\n"
+        "  (l...a.size).each do |i|\n"
+        "    a[l], a[i] = a[i], a[l]\n"
+        "    permute(a, l + 1)\n"
+        "    a[l], a[i] = a[i], a[l]\n"
+        "  end\n"
+        "end\n",
+        ("O(n!)", "O(n)"),
+    ),
+    (
+        "Ruby",
+        "def largest(arr)\n"
+        "  arr.max\n"
+        "end\n",
+        ("O(n)", "O(1)"),
+    ),
+]
+
+PROSE = [
+    "Here is the answer: just use a HashMap.",
+    "No code here, sorry.",
+    "I cannot help with that request.",
+    "Sorry, I can't do that.",
+    "Sorry",
+]
+
+
+@pytest.mark.parametrize("language, code, expected", CASES)
+def test_estimate_complexity(language, code, expected):
+    structure = parse_code(code, language)
+    assert structure is not None
+    assert estimate_complexity(structure) == expected
+
+
+@pytest.mark.parametrize("language", ["Python", "Java", "C++", "JavaScript", "Go", "Swift", "Ruby"])
+@pytest.mark.parametrize("text", PROSE)
+def test_prose_is_not_code(language, text):
+    assert parse_code(text, language) is None
+
+
+@pytest.mark.parametrize("language, code", [
+    ("Python", "def f(:\n    pass\n"),
+    ("Java", "int f() { {"),
+    ("Ruby", "def f\n  1\n"),
+])
+def test_unbalanced_code_does_not_parse(language, code):
+    assert parse_code(code, language) is None
+
+
+def test_unsupported_language_has_no_parser():
+    assert parse_code("fn main() {}", "Rust") is None
+
+
+def test_strip_code_fences_prefers_requested_language():
+    text = "```python\nprint(1)\n```\n\n```go\nfmt.Println(1)\n```"
+    assert strip_code_fences(text, "Go") == "fmt.Println(1)"
+    assert strip_code_fences(text) == "print(1)"
+    assert strip_code_fences("  x = 1  ") == "x = 1"
@@ -0,0 +1,202 @@
+# tests/test_pipeline.py
+
+import asyncio
+
+import pytest
+
+from pipeline import StageCache
+
+
+@pytest.mark.parametrize("response, language", [
+    ("```python\ndef f(a):\n    return sorted(a)\n```", "Python"),
+    ("```py\nfor x in a:\n    print(x)\n```", "Python"),
+    ("```\nint main(){return 0;}\n```", "C++"),
+    ("Here you go:\n\n```bash\npip install x\n```\n\n```\nputs [1, 2].sum\n```", "Ruby"),
+    ("```rust\nfn main() {}\n```", "Rust"),
+])
+def test_fenced_code_is_valid(pipeline, response, language):
+    assert pipeline.is_valid_response(response, language)
+
+
+@pytest.mark.parametrize("response, language", [
+    ("I'm sorry, but I can't help with that request.", "Python"),
+    ("def f(a):\n    return sorted(a)\n", "Python"),
+    ("```\nSorry, I can't do that.\n```", "Java"),
+    ("```java\nI cannot help with that request.\n```", "Java"),
+    ("```python\nprint(1)\n```", "Go"),
+    ("```\n\n```", "Rust"),
+])
+def test_refusals_and_other_languages_are_invalid(pipeline, response, language):
+    assert not pipeline.is_valid_response(response, language)
+
+
+def test_race_keeps_the_first_valid_answer(pipeline, fake_model):
+    pipeline.models["o1-mini"] = fake_model("o1-mini", "Sorry, I can't do that.")
+    pipeline.models["gpt4o"] = fake_model("gpt4o", "```python\nprint(1)\n```", delay=0.01)
+    pipeline.models["llama-3-2"] = fake_model("llama-3-2", "```python\nprint(2)\n```", delay=1)
+
+    result = asyncio.run(pipeline.arace_models("Print one", "Python"))
+
+    assert result["model_name"] == "gpt4o"
+    assert result["code"] == "```python\nprint(1)\n```"
+    assert result["raced"] == ["o1-mini", "gpt4o", "llama-3-2"]
+
+
+def test_race_reports_every_failure(pipeline, fake_model):
+    pipeline.models["o1-mini"] = fake_model("o1-mini", error="rate limited")
+    pipeline.models["gpt4o"] = fake_model("gpt4o", error="invalid key")
+
+    with pytest.raises(RuntimeError) as error:
+        asyncio.run(pipeline.arace_models("Print one", "Python", ["o1-mini", "gpt4o"]))
+
+    assert "o1-mini: rate limited" in str(error.value)
+    assert "gpt4o: invalid key" in str(error.value)
+
+
+@pytest.mark.parametrize("model_names, max_models", [
+    (["o1-mini"], 0),
+    ("gpt4o", 3),
+    (["gpt-5"], 3),
+])
+def test_race_rejects_bad_arguments(pipeline, model_names, max_models):
+    with pytest.raises(ValueError):
+        asyncio.run(pipeline.arace_models("Print one", "Python", model_names, max_models=max_models))
+
+
+def test_race_reuses_cached_answers(pipeline, fake_model):
+    racers = {
+        "o1-mini": fake_model("o1-mini", "```python\nprint(1)\n```"),
+        "gpt4o": fake_model("gpt4o", "```python\nprint(2)\n```", delay=1),
+    }
+    pipeline.models.update(racers)
+
+    first = asyncio.run(pipeline.arace_models("Print one", "Python", list(racers)))
+    second = asyncio.run(pipeline.arace_models("Print one", "Python", list(racers)))
+
+    assert first == second
+    assert racers["o1-mini"].calls == 1
+    # The loser's call was really cancelled rather than left running
+    assert racers["gpt4o"].cancelled
+
+
+def test_race_shares_calls_with_comparison_runs(pipeline, fake_model):
+    racers = {
+        "o1-mini": fake_model("o1-mini", "```python\nprint(1)\n```"),
+        "gpt4o": fake_model("gpt4o", "```python\nprint(2)\n```", delay=0.05),
+    }
+    pipeline.models.update(racers)
+
+    async def submit():
+        return await asyncio.gather(
+            pipeline.arace_models("Print one", "Python", list(racers)),
+            pipeline.arun_models("Print one", "Python", {"Model 1": "gpt4o"}),
+        )
+
+    race_result, comparison = asyncio.run(submit())
+
+    assert race_result["model_name"] == "o1-mini"
+    # Losing the race does not cancel the call the comparison run is still waiting on
+    assert comparison["Model 1"]["code"] == "```python\nprint(2)\n```"
+    assert racers["gpt4o"].calls == 1
+    assert not racers["gpt4o"].cancelled
+
+
+def test_stage_cache_evicts_the_least_recently_used_entry():
+    cache = StageCache(max_entries=2)
+    cache.set("generate", "a", "code a")
+    cache.set("generate", "b", "code b")
+    cache.get("generate", "a")
+    cache.set("generate", "c", "code c")
+
+    assert cache.get("generate", "a") == "code a"
+    assert cache.get("generate", "b") is None
+    assert cache.get("generate", "c") == "code c"
+
+
+def test_stage_cache_does_not_store_failures():
+    cache = StageCache()
+
+    async def fail():
+        raise RuntimeError("provider unavailable")
+
+    async def succeed():
+        return "code"
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.aget("generate", "key", fail))
+    assert asyncio.run(cache.aget("generate", "key", succeed)) == "code"
+    assert not cache.in_flight
+
+
+def test_switching_language_reuses_the_processed_question(pipeline):
+    asyncio.run(pipeline.agenerate_code("Reverse a list", "Python", "gpt4o"))
+    asyncio.run(pipeline.agenerate_code("Reverse a list", "Java", "gpt4o"))
+
+    assert pipeline.llama_model.calls == 1
+    assert pipeline.models["gpt4o"].calls == 2
+
+
+def test_adding_a_comparison_model_reuses_the_base_model_entries(pipeline):
+    async def submit(model_names):
+        results = await pipeline.arun_models("Reverse a list", "Python", model_names)
+        snippets = {model_key: result["code"] for model_key, result in results.items()}
+        return results, await pipeline.aanalyze_complexity(snippets, language="Python")
+
+    first, _ = asyncio.run(submit({"Base Model": "o1-preview"}))
+    second, analysis = asyncio.run(submit({"Base Model": "o1-preview", "gpt4o": "gpt4o"}))
+
+    assert second["Base Model"] == first["Base Model"]
+    assert pipeline.models["o1-preview"].calls == 1
+    assert pipeline.models["o1-preview"].explanations == 1
+    # A time and a space question for the base snippet, then for the gpt4o snippet only
+    assert pipeline.analyzer.model.calls == 4
+    assert set(analysis) == {"Base Model", "gpt4o"}
+
+
+def test_failed_generations_are_not_cached(pipeline):
+    model = pipeline.models["gpt4o"]
+    model.error = "rate limited"
+    failed = asyncio.run(pipeline.agenerate_and_explain("gpt4o", "Reverse a list", "Python"))
+    model.error = None
+    retried = asyncio.run(pipeline.agenerate_and_explain("gpt4o", "Reverse a list", "Python"))
+
+    assert failed["code"] == "Error generating code."
+    assert retried["code"] == model.response
+    assert model.calls == 2
+
+
+def test_analyzer_errors_are_not_cached(pipeline):
+    snippets = {"Base Model": "print(1)"}
+    pipeline.analyzer.model.error = "provider unavailable"
+    failed = asyncio.run(pipeline.aanalyze_complexity(snippets, language="Python"))
+    pipeline.analyzer.model.error = None
+    retried = asyncio.run(pipeline.aanalyze_complexity(snippets, language="Python"))
+
+    assert failed["Base Model"]["error"] == "provider unavailable"
+    assert retried["Base Model"]["error"] is None
+
+
+def test_entries_are_keyed_by_registry_name(pipeline, fake_model):
+    # Two instances of one class, e.g. the same client pointed at different models
+    pipeline.models["gpt4o"] = fake_model("gpt4o", "```python\nprint(4)\n```")
+    pipeline.models["mistral"] = fake_model("mistral", "```python\nprint(7)\n```")
+
+    gpt4o_code = asyncio.run(pipeline.agenerate_code("Print a number", "Python", "gpt4o"))
+    mistral_code = asyncio.run(pipeline.agenerate_code("Print a number", "Python", "mistral"))
+
+    assert (gpt4o_code, mistral_code) == ("```python\nprint(4)\n```", "```python\nprint(7)\n```")
+
+
+def test_fresh_requests_bypass_and_replace_cached_entries(pipeline):
+    model = pipeline.models["gpt4o"]
+    asyncio.run(pipeline.agenerate_code("Reverse a list", "Python", "gpt4o"))
+    model.response = "```python\nprint('new')\n```"
+
+    cached = asyncio.run(pipeline.agenerate_code("Reverse a list", "Python", "gpt4o"))
+    fresh = asyncio.run(pipeline.agenerate_code("Reverse a list", "Python", "gpt4o", fresh=True))
+    after = asyncio.run(pipeline.agenerate_code("Reverse a list", "Python", "gpt4o"))
+
+    assert cached == "```python\nprint('gpt4o')\n```"
+    assert fresh == after == "```python\nprint('new')\n```"
+    assert model.calls == 2
+    assert pipeline.llama_model.calls == 2
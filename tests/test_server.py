@@ -0,0 +1,139 @@
+# tests/test_server.py
+
+import pytest
+from starlette.testclient import TestClient
+
+import server
+
+
+@pytest.fixture
+def client(monkeypatch, secrets, fake_pipeline):
+    monkeypatch.setattr(server, "load_secrets", lambda: secrets)
+    with TestClient(server.app) as client:
+        fake_pipeline(server.app.state.pipeline)
+        yield client
+
+
+def test_generate_uses_the_requested_model(client):
+    response = client.post("/generate", json={"question": "Reverse a list", "language": "Python", "model": "gpt4o"})
+
+    assert response.status_code == 200
+    assert response.json() == {"model_name": "gpt4o", "code": "```python\nprint('gpt4o')\n```"}
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/generate", {"question": "Reverse a list", "language": "Python", "model": "gpt-5"}),
+    ("/explain", {"code": "print(1)", "model": "gpt-5"}),
+    ("/stream", {"question": "Reverse a list", "language": "Python", "model": "gpt-5"}),
+])
+def test_unknown_models_are_rejected(client, path, payload):
+    response = client.post(path, json=payload)
+
+    assert response.status_code == 400
+    assert "Unknown model" in response.json()["error"]
+
+
+@pytest.mark.parametrize("payload", [
+    {"code_snippets": {"Base Model": {"code": "print(1)"}}},
+    {"code_snippets": {"Base Model": 42}},
+    {"code_snippets": ["print(1)"]},
+    {"code_snippets": {"Base Model": "print(1)"}, "language": ["Python"]},
+    {"code_snippets": {"Base Model": "print(1)"}, "language": "Python", "local": "false"},
+    {"code_snippets": {"Base Model": "print(1)"}, "language": "Python", "local": 1},
+])
+def test_analyze_rejects_malformed_payloads(client, payload):
+    response = client.post("/analyze", json=payload)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("payload", [
+    {"models": "gpt4o"},
+    {"models": []},
+    {"models": ["gpt4o", "gpt-5"]},
+    {"models": [["gpt4o"]]},
+    {"max_models": 0},
+    {"max_models": "2"},
+    {"max_models": True},
+])
+def test_race_rejects_bad_models_and_caps(client, payload):
+    response = client.post("/race", json={"question": "Reverse a list", "language": "Python", **payload})
+
+    assert response.status_code == 400
+
+
+def test_race_returns_the_winner(client):
+    response = client.post("/race", json={
+        "question": "Reverse a list", "language": "Python", "models": ["gpt4o"], "max_models": 1,
+    })
+
+    assert response.status_code == 200
+    assert response.json()["model_name"] == "gpt4o"
+    assert response.json()["raced"] == ["gpt4o"]
+
+
+def test_race_reports_provider_failures_as_bad_gateway(client):
+    pipeline = server.app.state.pipeline
+    for model_name in ("o1-mini", "gpt4o"):
+        pipeline.models[model_name].error = "provider unavailable"
+
+    response = client.post("/race", json={
+        "question": "Reverse a list", "language": "Python", "models": ["o1-mini", "gpt4o"],
+    })
+
+    assert response.status_code == 502
+    assert "o1-mini: provider unavailable" in response.json()["error"]
+
+
+def test_generate_reuses_cached_code_unless_fresh(client):
+    model = server.app.state.pipeline.models["gpt4o"]
+    payload = {"question": "Reverse a list", "language": "Python", "model": "gpt4o"}
+
+    client.post("/generate", json=payload)
+    client.post("/generate", json=payload)
+    assert model.calls == 1
+
+    response = client.post("/generate", json={**payload, "fresh": True})
+    assert response.status_code == 200
+    assert model.calls == 2
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/generate", {"question": "Reverse a list", "language": "Python", "fresh": "true"}),
+    ("/explain", {"code": "print(1)", "fresh": 1}),
+    ("/analyze", {"code_snippets": {"Base Model": "print(1)"}, "fresh": "false"}),
+    ("/race", {"question": "Reverse a list", "language": "Python", "fresh": None}),
+])
+def test_fresh_must_be_a_boolean(client, path, payload):
+    response = client.post(path, json=payload)
+
+    assert response.status_code == 400
+
+
+def test_analyze_returns_local_estimates(client):
+    response = client.post("/analyze", json={
+        "code_snippets": {"Base Model": "for x in a:\n    print(x)\n"},
+        "language": "Python",
+        "local": True,
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {"Base Model": {"time_complexity": "O(n)", "space_complexity": "O(1)", "error": None}}
+
+
+@pytest.mark.parametrize("payload", [
+    {"local": "false"},
+    {"model": ["gpt4o"]},
+])
+def test_stream_rejects_malformed_payloads(client, payload):
+    response = client.post("/stream", json={"question": "Reverse a list", "language": "Python", **payload})
+
+    assert response.status_code == 400
+
+
+def test_stream_emits_every_stage(client):
+    response = client.post("/stream", json={"question": "Reverse a list", "language": "Python", "model": "o1-mini"})
+
+    assert response.status_code == 200
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events == ["code", "explanation", "analysis", "done"]